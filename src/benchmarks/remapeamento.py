@@ -0,0 +1,91 @@
+"""
+Compara o número de episódios até a convergência após uma mudança de dispositivos,
+treinando do zero e a partir da tabela Q remapeada.
+
+A convergência é o primeiro ponto em que os valores da política gulosa (o máximo da tabela Q
+em cada hora) ficam a menos de TOLERANCIA dos valores ao fim de MAX_EPOCAS episódios. Cada
+semente de SEMENTES repete todo o experimento, incluindo o treinamento inicial, e o resultado
+mostra a mediana e o intervalo (mínimo-máximo) entre as sementes.
+
+Execute a partir de src/: python -m benchmarks.remapeamento
+"""
+import io
+import contextlib
+import numpy as np
+from models.agent import QLearningAgent, remapear_tabela_q
+from models.environment import EnergyManagementEnvironment
+
+
+DISPOSITIVOS = [("geladeira", 150, 1), ("ar_condicionado", 1200, 1), ("televisao", 100, 2), ("lampada", 60, 2)]
+HORA_DORMIR = 22
+HORA_ACORDAR = 6
+EPOCAS_INICIAIS = 3000
+INTERVALO = 10
+MAX_EPOCAS = 2000
+TOLERANCIA = 0.02
+SEMENTES = range(5)
+
+
+def criar_ambiente(dispositivos):
+    return EnergyManagementEnvironment(dispositivos, hora_dormir=HORA_DORMIR, hora_acordar=HORA_ACORDAR)
+
+
+def treinar_silencioso(agente, numero_epocas):
+    with contextlib.redirect_stdout(io.StringIO()):
+        agente.treinar(numero_epocas=numero_epocas)
+
+
+def epocas_ate_convergir(ambiente, tabela_q=None):
+    """
+    Treina em blocos de INTERVALO episódios e conta os episódios até os valores se estabilizarem.
+
+    Returns:
+        int: Episódios até a convergência.
+    """
+    agente = QLearningAgent(ambiente, tabela_q=None if tabela_q is None else tabela_q.copy())
+    valores = [agente.tabela_q.max(axis=1)]
+    for _ in range(MAX_EPOCAS // INTERVALO):
+        treinar_silencioso(agente, INTERVALO)
+        valores.append(agente.tabela_q.max(axis=1))
+
+    valores = np.array(valores)
+    erro = np.abs(valores - valores[-1]).max(axis=1) / np.abs(valores[-1]).max()
+    return int(np.flatnonzero(erro < TOLERANCIA)[0]) * INTERVALO
+
+
+def main():
+    mudancas = {
+        "remover lampada": [d for d in DISPOSITIVOS if d[0] != "lampada"],
+        "adicionar ventilador": DISPOSITIVOS + [("ventilador", 80, 1)],
+        "mais uma televisao": [("televisao", 100, 3) if d[0] == "televisao" else d for d in DISPOSITIVOS],
+    }
+    resultados = {descricao: {"do zero": [], "remapeada": []} for descricao in mudancas}
+
+    for semente in SEMENTES:
+        np.random.seed(semente)
+        ambiente_original = criar_ambiente(DISPOSITIVOS)
+        agente = QLearningAgent(ambiente_original)
+        treinar_silencioso(agente, EPOCAS_INICIAIS)
+        dispositivos_originais = list(ambiente_original.dispositivos)
+
+        for descricao, dispositivos in mudancas.items():
+            ambiente = criar_ambiente(dispositivos)
+
+            np.random.seed(semente)
+            resultados[descricao]["do zero"].append(epocas_ate_convergir(ambiente))
+
+            np.random.seed(semente)
+            remapeada = remapear_tabela_q(agente.tabela_q, dispositivos_originais, ambiente.dispositivos)
+            resultados[descricao]["remapeada"].append(epocas_ate_convergir(ambiente, remapeada))
+
+    def resumo(epocas):
+        return f"{np.median(epocas):.0f} [{min(epocas)}-{max(epocas)}]"
+
+    print(f"Mediana [mínimo-máximo] de episódios em {len(SEMENTES)} sementes")
+    print(f"{'mudança':<24}{'do zero':>18}{'remapeada':>18}")
+    for descricao, epocas in resultados.items():
+        print(f"{descricao:<24}{resumo(epocas['do zero']):>18}{resumo(epocas['remapeada']):>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,50 @@ import numpy as np
 import math
 
 
+def remapear_tabela_q(tabela_q, dispositivos_anteriores, dispositivos_novos):
+    """
+    Projeta uma tabela Q no espaço de ações de um novo conjunto de dispositivos.
+
+    Cada ação é um número binário com um bit por dispositivo (o primeiro dispositivo é o bit
+    mais significativo). Os bits de dispositivos removidos são marginalizados pelo máximo dos
+    valores, e os valores são repetidos para os dois estados de dispositivos adicionados.
+    O máximo é usado em vez da média porque a maior parte das ações nunca é visitada e
+    mantém valor zero, o que puxaria a média para baixo.
+
+    Args:
+        tabela_q (numpy.ndarray): Tabela Q no formato (max_tempo, 2**len(dispositivos_anteriores)).
+        dispositivos_anteriores (list): Nomes dos dispositivos da tabela, na ordem das ações.
+        dispositivos_novos (list): Nomes dos dispositivos do novo espaço de ações, na ordem das ações.
+
+    Returns:
+        numpy.ndarray: Tabela Q no formato (max_tempo, 2**len(dispositivos_novos)).
+
+    Raises:
+        ValueError: Se a tabela não corresponder aos dispositivos anteriores.
+    """
+    anteriores = list(dispositivos_anteriores)
+    novos = list(dispositivos_novos)
+    tabela_q = np.asarray(tabela_q)
+    max_tempo = tabela_q.shape[0]
+    if tabela_q.shape[1] != 2**len(anteriores):
+        raise ValueError(f"Tabela Q com {tabela_q.shape[1]} ações não corresponde a {len(anteriores)} dispositivos.")
+
+    # Um eixo de tamanho 2 por dispositivo, na mesma ordem dos bits da ação.
+    tabela = tabela_q.reshape((max_tempo,) + (2,) * len(anteriores))
+
+    removidos = tuple(1 + i for i, nome in enumerate(anteriores) if nome not in novos)
+    if removidos:
+        tabela = tabela.max(axis=removidos)
+    mantidos = [nome for nome in anteriores if nome in novos]
+    adicionados = [nome for nome in novos if nome not in mantidos]
+
+    tabela = tabela.reshape(tabela.shape + (1,) * len(adicionados))
+    eixos = [1 + mantidos.index(nome) if nome in mantidos else 1 + len(mantidos) + adicionados.index(nome) for nome in novos]
+    tabela = np.transpose(tabela, [0] + eixos)
+
+    return np.broadcast_to(tabela, (max_tempo,) + (2,) * len(novos)).reshape(max_tempo, 2**len(novos)).copy()
+
+
 class QLearningAgent:
     """
     Agente que utiliza o algoritmo Q-Learning para gerenciar o consumo de energia.
@@ -70,20 +114,24 @@ class QLearningAgent:
             recompensa + self.gama * self.tabela_q[proximo_estado, melhor_proxima_ação] - self.tabela_q[estado, ação]
         )
 
-    def treinar(self, numero_epocas=10000, fator_velocidade=1.0):
+    def treinar(self, numero_epocas=10000, fator_velocidade=1.0, registro=None):
         """
         Treina o agente usando o algoritmo Q-Learning.
 
         Args:
             numero_epocas (int, optional): Número de episódios de treinamento. Padrão é 5000.
             fator_velocidade (float, optional): Fator para ajustar a velocidade do treinamento. Padrão é 1.0.
+            registro (RegistroTreinamento, optional): Registro onde as métricas são gravadas. Se informado,
+                as métricas não são acumuladas em listas e o retorno traz a amostra em memória do registro.
 
         Returns:
-            tuple: Listas de recompensas, consumos e a tabela Q treinada.
+            tuple: Recompensas, consumos e a tabela Q treinada. Sem registro, recompensas e consumos são
+            listas com todos os episódios. Com registro, são arrays da amostra em memória do registro
+            (reservatório ou passo, conforme a amostragem escolhida), ordenados por época e com no
+            máximo registro.tamanho_amostra episódios.
         """
         todas_recompensas = []
         todos_consumos = []
-        resultados = []
 
         epocas = math.ceil(numero_epocas / fator_velocidade)
 
@@ -99,14 +147,17 @@ class QLearningAgent:
                 recompensa, consumo, terminado = self.ambiente.executar_passos(ação_decodificada)
                 proximo_estado = self.ambiente.tempo
                 self.atualizar_tabela_q(estado, ação, recompensa, proximo_estado)
+                if registro is not None:
+                    registro.registrar_passo(epoca, estado, ação, recompensa, consumo)
                 estado = proximo_estado
                 recompensa_total += recompensa
                 consumo_total += consumo
 
-            todas_recompensas.append(recompensa_total)
-            todos_consumos.append(consumo_total)
-
-            resultados.append([epoca, ação_decodificada, consumo, sum(todos_consumos)])
+            if registro is not None:
+                registro.registrar_episodio(epoca, recompensa_total, consumo_total, self.epsilon)
+            else:
+                todas_recompensas.append(recompensa_total)
+                todos_consumos.append(consumo_total)
 
             self.epsilon = max(0.01, self.epsilon * 0.99)
             self.gama = min(0.95, self.gama + 0.001)
@@ -114,11 +165,21 @@ class QLearningAgent:
             if epoca % 100 == 0:
                 print(f"Episódio {epoca} concluído. Recompensa: {recompensa_total:.2f}, Consumo: {consumo_total:.2f} kWh")
 
+        if registro is not None:
+            amostra = registro.amostra()
+            return amostra["recompensa"], amostra["consumo"], self.tabela_q
+
         return todas_recompensas, todos_consumos, self.tabela_q
 
-    def atualizar_numero_dispositivos(self):
+    def atualizar_numero_dispositivos(self, dispositivos_anteriores=None):
         """
         Atualiza o número de dispositivos e o número de ações no agente.
+
+        Args:
+            dispositivos_anteriores (list, optional): Nomes dos dispositivos para os quais a tabela Q foi
+                treinada. Se informado, a tabela Q é remapeada para os dispositivos atuais do ambiente.
         """
         self.numero_dispositivos = len(self.ambiente.dispositivos)
-        self.numero_acoes = 2**self.numero_dispositivos
\ No newline at end of file
+        self.numero_acoes = 2**self.numero_dispositivos
+        if dispositivos_anteriores is not None and list(dispositivos_anteriores) != list(self.ambiente.dispositivos):
+            self.tabela_q = remapear_tabela_q(self.tabela_q, dispositivos_anteriores, self.ambiente.dispositivos)
\ No newline at end of file
@@ -0,0 +1,198 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from models.agent import remapear_tabela_q
+
+
+class CachePoliticas:
+    """
+    Cache em disco de tabelas Q treinadas, endereçado pelo hash da configuração e com remoção LRU.
+    """
+
+    ARQUIVO_INDICE = "indice.json"
+
+    def __init__(self, diretorio, tamanho_maximo=50 * 1024 * 1024, distancia_maxima=20):
+        """
+        Inicializa o cache e carrega o índice existente.
+
+        Args:
+            diretorio (str): Diretório do cache.
+            tamanho_maximo (int, optional): Tamanho máximo (bytes) das tabelas guardadas. Padrão é 50 MB.
+            distancia_maxima (int, optional): Distância máxima para que uma entrada sirva de ponto de partida
+                em mais_proxima. Cada dispositivo adicionado ou removido soma 10, cada hora de diferença nos
+                horários soma 1 e cada preço diferente soma 1. Padrão é 20.
+        """
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self.distancia_maxima = distancia_maxima
+        os.makedirs(diretorio, exist_ok=True)
+        self.indice = self._carregar_indice()
+
+    @staticmethod
+    def configuracao(ambiente, hiperparametros):
+        """
+        Monta a configuração que identifica uma política treinada.
+
+        Args:
+            ambiente (EnergyManagementEnvironment): Ambiente do treinamento.
+            hiperparametros (dict): Hiperparâmetros do treinamento (alfa, gama, epsilon, número de épocas...).
+
+        Returns:
+            dict: Configuração serializável em JSON.
+        """
+        return {
+            "dispositivos": [[nome, float(dispositivo["consumo"])] for nome, dispositivo in ambiente.dispositivos.items()],
+            "hora_dormir": ambiente.hora_dormir,
+            "hora_acordar": ambiente.hora_acordar,
+            "preco_energia": [float(preco) for preco in ambiente.preco_energia],
+            "max_tempo": ambiente.max_tempo,
+            "recompensa": ambiente.avaliador_recompensa.especificacao,
+            "hiperparametros": dict(hiperparametros),
+        }
+
+    @staticmethod
+    def chave(configuracao):
+        """
+        Calcula a chave (SHA-256) de uma configuração.
+
+        Args:
+            configuracao (dict): Configuração gerada por CachePoliticas.configuracao.
+
+        Returns:
+            str: Hash hexadecimal da configuração canônica.
+        """
+        canonica = json.dumps(configuracao, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonica.encode("utf-8")).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.npy")
+
+    def _carregar_indice(self):
+        caminho = os.path.join(self.diretorio, self.ARQUIVO_INDICE)
+        if not os.path.exists(caminho):
+            return {}
+        with open(caminho, encoding="utf-8") as arquivo:
+            indice = json.load(arquivo)
+        # Descarta entradas cujo arquivo foi apagado fora do cache.
+        return {chave: entrada for chave, entrada in indice.items() if os.path.exists(self._caminho(chave))}
+
+    def _salvar_indice(self):
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".json")
+        with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+            json.dump(self.indice, arquivo)
+        os.replace(temporario, os.path.join(self.diretorio, self.ARQUIVO_INDICE))
+
+    def _tocar(self, chave):
+        self.indice[chave]["acesso"] = max((entrada["acesso"] for entrada in self.indice.values()), default=0) + 1
+
+    def obter(self, configuracao):
+        """
+        Busca a tabela Q treinada com exatamente a configuração informada.
+
+        Args:
+            configuracao (dict): Configuração gerada por CachePoliticas.configuracao.
+
+        Returns:
+            tuple: Tabela Q e metadados guardados, ou None se não estiver no cache.
+        """
+        chave = self.chave(configuracao)
+        if chave not in self.indice:
+            return None
+        tabela_q = np.load(self._caminho(chave))
+        self._tocar(chave)
+        self._salvar_indice()
+        return tabela_q, self.indice[chave]["metadados"]
+
+    def guardar(self, configuracao, tabela_q, metadados=None):
+        """
+        Guarda uma tabela Q e remove as entradas menos usadas se o tamanho máximo for excedido.
+
+        Args:
+            configuracao (dict): Configuração gerada por CachePoliticas.configuracao.
+            tabela_q (numpy.ndarray): Tabela Q treinada.
+            metadados (dict, optional): Informações extras serializáveis em JSON.
+        """
+        chave = self.chave(configuracao)
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".npy")
+        with os.fdopen(descritor, "wb") as arquivo:
+            np.save(arquivo, np.asarray(tabela_q))
+        os.replace(temporario, self._caminho(chave))
+
+        self.indice[chave] = {
+            "configuracao": configuracao,
+            "metadados": metadados or {},
+            "tamanho": os.path.getsize(self._caminho(chave)),
+            "acesso": 0,
+        }
+        self._tocar(chave)
+        self._remover_excedentes(manter=chave)
+        self._salvar_indice()
+
+    def _remover_excedentes(self, manter):
+        total = sum(entrada["tamanho"] for entrada in self.indice.values())
+        for chave in sorted(self.indice, key=lambda chave: self.indice[chave]["acesso"]):
+            if total <= self.tamanho_maximo:
+                break
+            if chave == manter:
+                continue
+            total -= self.indice[chave]["tamanho"]
+            del self.indice[chave]
+            os.remove(self._caminho(chave))
+
+    def registros(self):
+        """
+        Lista os diretórios de registro referenciados pelas entradas do cache.
+
+        Returns:
+            list: Diretórios guardados nos metadados "registro".
+        """
+        return [entrada["metadados"]["registro"] for entrada in self.indice.values() if entrada["metadados"].get("registro")]
+
+    @staticmethod
+    def _distancia(configuracao, outra):
+        # Recompensa ou hiperparâmetros diferentes levam a outra política, não a um bom ponto de partida.
+        if any(configuracao[campo] != outra[campo] for campo in ("max_tempo", "recompensa", "hiperparametros")):
+            return None
+        dispositivos = {tuple(dispositivo) for dispositivo in configuracao["dispositivos"]}
+        dispositivos_outra = {tuple(dispositivo) for dispositivo in outra["dispositivos"]}
+        # Dispositivos diferentes pesam mais que horários ou preços, pois exigem remapear a tabela.
+        distancia = 10 * len(dispositivos ^ dispositivos_outra)
+        distancia += sum(a != b for a, b in zip(configuracao["preco_energia"], outra["preco_energia"]))
+        for campo in ("hora_dormir", "hora_acordar"):
+            if configuracao[campo] is not None and outra[campo] is not None:
+                diferenca = abs(configuracao[campo] - outra[campo])
+                distancia += min(diferenca, configuracao["max_tempo"] - diferenca)
+            else:
+                distancia += configuracao[campo] != outra[campo]
+        return distancia
+
+    def mais_proxima(self, configuracao):
+        """
+        Busca a tabela Q de configuração mais parecida para iniciar o treinamento a partir dela.
+
+        Só são consideradas entradas com o mesmo número de horas, a mesma recompensa, os mesmos
+        hiperparâmetros e distância até distancia_maxima. Se os dispositivos forem diferentes, a
+        tabela é remapeada para os dispositivos da configuração.
+
+        Args:
+            configuracao (dict): Configuração gerada por CachePoliticas.configuracao.
+
+        Returns:
+            tuple: Tabela Q mais próxima e a chave da entrada de origem, ou None se nenhuma for compatível.
+        """
+        candidatas = []
+        for chave, entrada in self.indice.items():
+            distancia = self._distancia(configuracao, entrada["configuracao"])
+            if distancia is not None and distancia <= self.distancia_maxima:
+                candidatas.append((distancia, -entrada["acesso"], chave))
+        if not candidatas:
+            return None
+
+        _, _, chave = min(candidatas)
+        self._tocar(chave)
+        self._salvar_indice()
+        dispositivos_anteriores = [nome for nome, _ in self.indice[chave]["configuracao"]["dispositivos"]]
+        dispositivos_novos = [nome for nome, _ in configuracao["dispositivos"]]
+        return remapear_tabela_q(np.load(self._caminho(chave)), dispositivos_anteriores, dispositivos_novos), chave
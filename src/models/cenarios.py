@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class GeradorCenarios:
+    """
+    Gera perfis diários estocásticos para avaliar políticas em condições de ocupação reais.
+    """
+
+    def __init__(self, ambiente, desvio_horarios=1, prob_disponibilidade=0.95, ruido_consumo=0.1, ruido_preco=0.1, semente=None):
+        """
+        Inicializa o gerador a partir de um ambiente de referência.
+
+        Args:
+            ambiente (EnergyManagementEnvironment): Ambiente cujos dispositivos, horários e preços servem de base.
+            desvio_horarios (int, optional): Deslocamento máximo (em horas) dos horários de dormir e acordar. Padrão é 1.
+            prob_disponibilidade (float, optional): Probabilidade de cada dispositivo estar disponível no dia. Padrão é 0.95.
+            ruido_consumo (float, optional): Desvio padrão relativo do consumo de cada dispositivo por hora. Padrão é 0.1.
+            ruido_preco (float, optional): Desvio padrão relativo do preço da energia por hora. Padrão é 0.1.
+            semente (int, optional): Semente do gerador de números aleatórios.
+        """
+        self.ambiente = ambiente
+        self.desvio_horarios = desvio_horarios
+        self.prob_disponibilidade = prob_disponibilidade
+        self.ruido_consumo = ruido_consumo
+        self.ruido_preco = ruido_preco
+        self.rng = np.random.default_rng(semente)
+
+    def gerar(self, numero_cenarios):
+        """
+        Gera os cenários como arrays NumPy.
+
+        Args:
+            numero_cenarios (int): Número de cenários a gerar.
+
+        Returns:
+            dict: Arrays "hora_dormir" e "hora_acordar" (S,), "disponibilidade" (S, D),
+            "fator_consumo" (S, T, D) e "preco" (S, T).
+        """
+        max_tempo = self.ambiente.max_tempo
+        numero_dispositivos = len(self.ambiente.dispositivos)
+        hora_dormir = 22 if self.ambiente.hora_dormir is None else self.ambiente.hora_dormir
+        hora_acordar = 6 if self.ambiente.hora_acordar is None else self.ambiente.hora_acordar
+
+        deslocamentos = self.rng.integers(-self.desvio_horarios, self.desvio_horarios + 1, size=(2, numero_cenarios))
+        fator_consumo = self.rng.normal(1.0, self.ruido_consumo, size=(numero_cenarios, max_tempo, numero_dispositivos))
+        fator_preco = self.rng.normal(1.0, self.ruido_preco, size=(numero_cenarios, max_tempo))
+
+        return {
+            "hora_dormir": ((hora_dormir + deslocamentos[0]) % max_tempo).astype(np.int16),
+            "hora_acordar": ((hora_acordar + deslocamentos[1]) % max_tempo).astype(np.int16),
+            "disponibilidade": self.rng.random((numero_cenarios, numero_dispositivos)) < self.prob_disponibilidade,
+            "fator_consumo": np.clip(fator_consumo, 0, None).astype(np.float32),
+            "preco": (np.asarray(self.ambiente.preco_energia, dtype=np.float32) * np.clip(fator_preco, 0, None)).astype(np.float32),
+        }
+
+
+def decodificar_acoes(acoes, numero_dispositivos):
+    """
+    Decodifica um array de ações inteiras em bits de estado, como QLearningAgent.decodificar_ação.
+
+    Args:
+        acoes (numpy.ndarray): Ações inteiras.
+        numero_dispositivos (int): Número de dispositivos (bits) por ação.
+
+    Returns:
+        numpy.ndarray: Array booleano com uma dimensão extra de tamanho numero_dispositivos.
+    """
+    deslocamentos = np.arange(numero_dispositivos - 1, -1, -1)
+    return ((np.asarray(acoes)[..., None] >> deslocamentos) & 1).astype(bool)
+
+
+def avaliar_politica(ambiente, tabela_q, cenarios, tamanho_lote=10000):
+    """
+    Avalia a política gulosa de uma tabela Q sobre todos os cenários de uma só vez.
+
+    Args:
+        ambiente (EnergyManagementEnvironment): Ambiente de referência (dispositivos e limite de consumo).
+        tabela_q (numpy.ndarray): Tabela Q treinada, no formato (max_tempo, 2**numero_dispositivos).
+        cenarios (dict): Cenários gerados por GeradorCenarios.gerar.
+        tamanho_lote (int, optional): Número de cenários processados por vez, para limitar a memória. Padrão é 10000.
+
+    Returns:
+        dict: Distribuições por cenário de "custo", "consumo" (kWh), "recompensa" e "violacoes"
+        (horas em que o consumo em kWh supera o limite de consumo convertido para kWh).
+
+    Raises:
+        ValueError: Se a tabela Q não corresponder aos dispositivos do ambiente.
+    """
+    numero_dispositivos = len(ambiente.dispositivos)
+    tabela_q = np.asarray(tabela_q)
+    if tabela_q.shape != (ambiente.max_tempo, 2**numero_dispositivos):
+        raise ValueError(f"Tabela Q de formato {tabela_q.shape} não corresponde ao ambiente ({ambiente.max_tempo}, {2**numero_dispositivos}).")
+
+    horas = np.arange(ambiente.max_tempo)
+    prioritarios = ambiente.mascara_prioritarios()
+    potencias = (ambiente.potencias_dispositivos() / 1000).astype(np.float32)
+    # calcular_limite_consumo soma potências em W, enquanto o consumo é medido em kWh por hora.
+    # A recompensa mantém essa comparação original, mas as violações usam unidades consistentes.
+    limite_consumo_kwh = ambiente.calcular_limite_consumo() / 1000
+
+    # O estado é apenas a hora, então a política gulosa é a mesma para todos os cenários.
+    bits = decodificar_acoes(np.argmax(tabela_q, axis=1), numero_dispositivos)
+    estados_base = np.where(prioritarios, (horas % 3 == 0)[:, None], bits)
+
+    numero_cenarios = len(cenarios["hora_dormir"])
+    resultado = {
+        "custo": np.empty(numero_cenarios),
+        "consumo": np.empty(numero_cenarios),
+        "recompensa": np.empty(numero_cenarios),
+        "violacoes": np.empty(numero_cenarios, dtype=np.int32),
+    }
+
+    for inicio in range(0, numero_cenarios, tamanho_lote):
+        lote = slice(inicio, inicio + tamanho_lote)
+        hora_dormir = cenarios["hora_dormir"][lote, None]
+        hora_acordar = cenarios["hora_acordar"][lote, None]
+
+        desligar = ambiente.mascara_desligamento(horas, hora_dormir, hora_acordar)
+        estados = estados_base & ~(desligar[:, :, None] & ~prioritarios)
+        estados &= cenarios["disponibilidade"][lote, None, :]
+
+        consumo = np.einsum("std,std,d->st", estados, cenarios["fator_consumo"][lote], potencias)
+        ligados_prioritarios = (estados & prioritarios).sum(axis=2)
+        ligados_comuns = estados.sum(axis=2) - ligados_prioritarios
+        recompensa = ambiente.calcular_recompensa_vetorizada(
+            consumo, horas, ligados_prioritarios, ligados_comuns, hora_dormir, hora_acordar
+        )
+
+        resultado["custo"][lote] = (consumo * cenarios["preco"][lote]).sum(axis=1)
+        resultado["consumo"][lote] = consumo.sum(axis=1)
+        resultado["recompensa"][lote] = recompensa.sum(axis=1)
+        resultado["violacoes"][lote] = (consumo > limite_consumo_kwh).sum(axis=1)
+
+    return resultado
@@ -0,0 +1,215 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from models.cenarios import GeradorCenarios, decodificar_acoes
+
+
+class CoordenadorAlimentador:
+    """
+    Coordena muitas residências ligadas ao mesmo alimentador, evitando que todas liguem as cargas nas mesmas horas.
+    """
+
+    GRADES_POR_LOTE = 8
+
+    def __init__(self, ambiente, numero_residencias, capacidade_alimentador, gerador=None, fator_penalidade=50,
+                 tamanho_lote=500, numero_trabalhadores=None, memoria_maxima=1024**3, semente=None):
+        """
+        Inicializa o coordenador simulando as residências em arrays agrupados.
+
+        Args:
+            ambiente (EnergyManagementEnvironment): Ambiente de referência (dispositivos, horários e preços).
+            numero_residencias (int): Número de residências no alimentador.
+            capacidade_alimentador (float): Carga máxima (kWh por hora) suportada pelo alimentador.
+            gerador (GeradorCenarios, optional): Gerador das variações entre residências. Se None, usa o padrão.
+            fator_penalidade (float, optional): Penalidade por kWh acima da capacidade, rateada entre as residências. Padrão é 50.
+            tamanho_lote (int, optional): Número de residências processadas por vez. Padrão é 500.
+            numero_trabalhadores (int, optional): Número de threads. Se None, usa quantas couberem em memoria_maxima,
+                limitado ao número de CPUs.
+            memoria_maxima (int, optional): Memória (bytes) disponível para as grades dos lotes processados em
+                paralelo, usada para escolher o número de threads. Padrão é 1 GiB.
+            semente (int, optional): Semente do gerador de números aleatórios.
+        """
+        self.ambiente = ambiente
+        self.numero_residencias = numero_residencias
+        self.capacidade_alimentador = capacidade_alimentador
+        self.fator_penalidade = fator_penalidade
+        self.tamanho_lote = tamanho_lote
+        self.rng = np.random.default_rng(semente)
+
+        gerador = gerador if gerador is not None else GeradorCenarios(ambiente, semente=semente)
+        self.residencias = gerador.gerar(numero_residencias)
+
+        self.numero_dispositivos = len(ambiente.dispositivos)
+        if numero_trabalhadores is None:
+            # Cada thread mantém cerca de GRADES_POR_LOTE grades float32 (B, T, A) vivas ao mesmo tempo.
+            memoria_lote = self.GRADES_POR_LOTE * 4 * tamanho_lote * ambiente.max_tempo * 2**self.numero_dispositivos
+            numero_trabalhadores = max(1, min(os.cpu_count() or 1, memoria_maxima // memoria_lote))
+        self.numero_trabalhadores = numero_trabalhadores
+
+        self.horas = np.arange(ambiente.max_tempo)
+        self.prioritarios = ambiente.mascara_prioritarios()
+        self.potencias = (ambiente.potencias_dispositivos() / 1000).astype(np.float32)
+        self.bits = decodificar_acoes(np.arange(2**self.numero_dispositivos), self.numero_dispositivos).astype(np.float32)
+
+    def _lotes(self, indices=None):
+        if indices is None:
+            return [slice(inicio, inicio + self.tamanho_lote) for inicio in range(0, self.numero_residencias, self.tamanho_lote)]
+        return [indices[inicio:inicio + self.tamanho_lote] for inicio in range(0, len(indices), self.tamanho_lote)]
+
+    def _estados(self, lote):
+        hora_dormir = self.residencias["hora_dormir"][lote, None]
+        hora_acordar = self.residencias["hora_acordar"][lote, None]
+        disponivel = self.residencias["disponibilidade"][lote, None, :]
+        potencia = self.residencias["fator_consumo"][lote] * self.potencias
+
+        ligados_prioritarios = disponivel & self.prioritarios & (self.horas % 3 == 0)[:, None]
+        desligar = self.ambiente.mascara_desligamento(self.horas, hora_dormir, hora_acordar)
+        controlaveis = disponivel & ~self.prioritarios & ~desligar[:, :, None]
+        return hora_dormir, hora_acordar, potencia, ligados_prioritarios, controlaveis
+
+    def _grade(self, lote):
+        """
+        Calcula consumo e recompensa de cada residência do lote para cada hora e ação.
+
+        Returns:
+            tuple: Arrays float32 (B, T, A) de consumo (kWh) e de recompensa.
+        """
+        hora_dormir, hora_acordar, potencia, ligados_prioritarios, controlaveis = self._estados(lote)
+
+        consumo = (potencia * ligados_prioritarios).sum(axis=2)[:, :, None] + (potencia * controlaveis) @ self.bits.T
+        recompensa = self.ambiente.calcular_recompensa_vetorizada(
+            consumo,
+            self.horas[:, None],
+            ligados_prioritarios.sum(axis=2, dtype=np.float32)[:, :, None],
+            controlaveis.astype(np.float32) @ self.bits.T,
+            hora_dormir[:, :, None],
+            hora_acordar[:, :, None],
+        )
+        return consumo, recompensa
+
+    def _mapear(self, funcao, indices=None):
+        with ThreadPoolExecutor(max_workers=self.numero_trabalhadores) as executor:
+            return list(executor.map(funcao, self._lotes(indices)))
+
+    def _consumo_acoes(self, lote, acoes):
+        # Só o consumo das ações escolhidas: não monta a grade (B, T, A) nem calcula recompensas.
+        _, _, potencia, ligados_prioritarios, controlaveis = self._estados(lote)
+        ligados = ligados_prioritarios | (controlaveis & decodificar_acoes(acoes[lote], self.numero_dispositivos))
+        return (potencia * ligados).sum(axis=2)
+
+    def carga_por_residencia(self, acoes):
+        """
+        Calcula o consumo de cada residência em cada hora.
+
+        Args:
+            acoes (numpy.ndarray): Ações (N, T) de cada residência.
+
+        Returns:
+            numpy.ndarray: Consumo (N, T) em kWh.
+        """
+        return np.concatenate(self._mapear(lambda lote: self._consumo_acoes(lote, acoes)))
+
+    def calcular_recompensas(self, acoes):
+        """
+        Calcula a recompensa diária de cada residência incluindo o rateio da penalidade do alimentador.
+
+        A penalidade de cada hora é proporcional ao excesso da carga agregada sobre a capacidade
+        e dividida entre as residências conforme a participação de cada uma na carga.
+
+        Args:
+            acoes (numpy.ndarray): Ações (N, T) de cada residência.
+
+        Returns:
+            numpy.ndarray: Recompensa total (N,) de cada residência.
+        """
+        def recompensa_e_consumo(lote):
+            consumo, recompensa = self._grade(lote)
+            indices = acoes[lote, :, None].astype(np.intp)
+            return (
+                np.take_along_axis(recompensa, indices, axis=2)[:, :, 0],
+                np.take_along_axis(consumo, indices, axis=2)[:, :, 0],
+            )
+
+        partes = self._mapear(recompensa_e_consumo)
+        recompensa = np.concatenate([r for r, _ in partes])
+        consumo = np.concatenate([c for _, c in partes])
+
+        carga = consumo.sum(axis=0)
+        excesso = np.maximum(carga - self.capacidade_alimentador, 0)
+        participacao = np.divide(consumo, carga, out=np.zeros_like(consumo), where=carga > 0)
+        return (recompensa - self.fator_penalidade * excesso * participacao).sum(axis=1)
+
+    def acoes_da_tabela_q(self, tabela_q):
+        """
+        Replica a política gulosa de uma tabela Q em todas as residências.
+
+        Args:
+            tabela_q (numpy.ndarray): Tabela Q treinada.
+
+        Returns:
+            numpy.ndarray: Ações (N, T) de cada residência.
+        """
+        acoes = np.argmax(tabela_q, axis=1).astype(np.int16)
+        return np.broadcast_to(acoes, (self.numero_residencias, len(acoes))).copy()
+
+    def coordenar(self, tabela_q=None, iteracoes=50, passo=10.0, taxa_atualizacao=0.2):
+        """
+        Ajusta as políticas das residências para achatar a curva agregada do alimentador.
+
+        A cada iteração um preço-sombra por hora é elevado nas horas em que a carga agregada
+        excede a capacidade, e uma fração das residências escolhe, hora a hora, a ação que
+        maximiza a própria recompensa menos o preço-sombra vezes o consumo. Atualizar apenas
+        uma fração evita que todas as residências migrem juntas para a mesma hora.
+
+        Args:
+            tabela_q (numpy.ndarray, optional): Política inicial compartilhada. Se None, cada residência parte da própria ação gulosa.
+            iteracoes (int, optional): Número de iterações. Padrão é 50.
+            passo (float, optional): Passo do ajuste do preço-sombra por excesso relativo. Padrão é 10.0.
+            taxa_atualizacao (float, optional): Fração das residências que reavaliam a política a cada iteração. Padrão é 0.2.
+
+        Returns:
+            dict: "acoes" (N, T) com as políticas ajustadas, "carga_inicial" e "carga_agregada" (T,),
+            "precos_sombra" (T,) e "picos" com o pico de carga em cada iteração.
+        """
+        precos_sombra = np.zeros(self.ambiente.max_tempo)
+
+        def melhor_resposta(lote):
+            consumo, recompensa = self._grade(lote)
+            acoes = np.argmax(recompensa - precos_sombra[:, None] * consumo, axis=2)
+            return acoes, np.take_along_axis(consumo, acoes[:, :, None], axis=2)[:, :, 0]
+
+        if tabela_q is not None:
+            acoes = self.acoes_da_tabela_q(tabela_q)
+            carga_residencias = self.carga_por_residencia(acoes)
+        else:
+            partes = self._mapear(melhor_resposta)
+            acoes = np.concatenate([a for a, _ in partes]).astype(np.int16)
+            carga_residencias = np.concatenate([c for _, c in partes])
+
+        carga_inicial = carga_residencias.sum(axis=0)
+        carga = carga_inicial
+        melhores_acoes, menor_pico = acoes.copy(), carga.max()
+        picos = [menor_pico]
+
+        for _ in range(iteracoes):
+            excesso_relativo = (carga - self.capacidade_alimentador) / self.capacidade_alimentador
+            precos_sombra = np.maximum(precos_sombra + passo * excesso_relativo, 0)
+
+            atualizar = np.flatnonzero(self.rng.random(self.numero_residencias) < taxa_atualizacao)
+            if len(atualizar):
+                partes = self._mapear(melhor_resposta, atualizar)
+                acoes[atualizar] = np.concatenate([a for a, _ in partes])
+                carga_residencias[atualizar] = np.concatenate([c for _, c in partes])
+
+            carga = carga_residencias.sum(axis=0)
+            picos.append(carga.max())
+            if picos[-1] < menor_pico:
+                melhores_acoes, menor_pico = acoes.copy(), picos[-1]
+
+        return {
+            "acoes": melhores_acoes,
+            "carga_inicial": carga_inicial,
+            "carga_agregada": self.carga_por_residencia(melhores_acoes).sum(axis=0),
+            "precos_sombra": precos_sombra,
+            "picos": picos,
+        }
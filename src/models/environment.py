@@ -1,3 +1,7 @@
+import numpy as np
+from models.recompensa import AvaliadorRecompensa
+
+
 class EnergyManagementEnvironment:
     """
     Ambiente para gerenciamento de energia residencial utilizando Q-Learning.
@@ -5,7 +9,7 @@ class EnergyManagementEnvironment:
 
     DISPOSITIVOS_PRIORITARIOS = ["geladeira", "frigobar"]
 
-    def __init__(self, lista_dispositivos, preco_energia=None, max_tempo=24, hora_dormir=None, hora_acordar=None):
+    def __init__(self, lista_dispositivos, preco_energia=None, max_tempo=24, hora_dormir=None, hora_acordar=None, especificacao_recompensa=None):
         """
         Inicializa o ambiente com uma lista de dispositivos e preços de energia.
 
@@ -15,6 +19,8 @@ class EnergyManagementEnvironment:
             max_tempo (int, optional): Número máximo de etapas (horas) no ambiente. Padrão é 24.
             hora_dormir (int, optional): Hora de dormir. Padrão é 22.
             hora_acordar (int, optional): Hora de acordar. Padrão é 6.
+            especificacao_recompensa (dict or AvaliadorRecompensa, optional): Especificação da recompensa.
+                Se None, usa a recompensa padrão.
         """
         self.dispositivos = self.gerar_dispositivos(lista_dispositivos)
         self.tempo = 0
@@ -22,6 +28,10 @@ class EnergyManagementEnvironment:
         self.hora_dormir = hora_dormir
         self.hora_acordar = hora_acordar 
         self.preco_energia = preco_energia if preco_energia else [0.5 if 22 <= i < 5 else 0.2 for i in range(self.max_tempo)]
+        if isinstance(especificacao_recompensa, AvaliadorRecompensa):
+            self.avaliador_recompensa = especificacao_recompensa
+        else:
+            self.avaliador_recompensa = AvaliadorRecompensa(especificacao_recompensa)
 
     def gerar_dispositivos(self, lista_dispositivos):
         """
@@ -72,10 +82,97 @@ class EnergyManagementEnvironment:
             self.dispositivos[dispositivo]["estado"] = 0
         return self.tempo
 
+    def mascara_prioritarios(self):
+        """
+        Indica quais dispositivos são prioritários, na ordem de self.dispositivos.
+
+        Returns:
+            numpy.ndarray: Vetor booleano com True para dispositivos prioritários.
+        """
+        return np.array(
+            [any(prio in dispositivo.lower() for prio in self.DISPOSITIVOS_PRIORITARIOS) for dispositivo in self.dispositivos],
+            dtype=bool,
+        )
+
+    def potencias_dispositivos(self):
+        """
+        Retorna a potência (W) de cada dispositivo, na ordem de self.dispositivos.
+
+        Returns:
+            numpy.ndarray: Vetor de potências.
+        """
+        return np.array([dispositivo["consumo"] for dispositivo in self.dispositivos.values()], dtype=float)
+
+    def mascara_desligamento(self, horas, hora_dormir=None, hora_acordar=None):
+        """
+        Calcula, de forma vetorizada, as horas em que os dispositivos não prioritários são desligados.
+
+        Args:
+            horas (numpy.ndarray): Horas a avaliar.
+            hora_dormir (int or numpy.ndarray, optional): Hora de dormir. Se None, usa a do ambiente.
+            hora_acordar (int or numpy.ndarray, optional): Hora de acordar. Se None, usa a do ambiente.
+
+        Returns:
+            numpy.ndarray: Máscara booleana no formato resultante do broadcast dos argumentos.
+        """
+        hora_dormir = self.hora_dormir if hora_dormir is None else hora_dormir
+        hora_acordar = self.hora_acordar if hora_acordar is None else hora_acordar
+        return np.where(
+            hora_dormir < hora_acordar,
+            (hora_dormir <= horas) & (horas <= hora_acordar),
+            (horas >= hora_dormir) | (horas <= hora_acordar),
+        )
+
+    def calcular_recompensa_vetorizada(self, consumo_total, horas, ligados_prioritarios, ligados_comuns, hora_dormir=None, hora_acordar=None):
+        """
+        Calcula as recompensas de executar_passos sobre arrays de passos.
+
+        Args:
+            consumo_total (numpy.ndarray): Consumo total (kWh) de cada passo.
+            horas (numpy.ndarray): Hora de cada passo.
+            ligados_prioritarios (numpy.ndarray): Número de dispositivos prioritários ligados em cada passo.
+            ligados_comuns (numpy.ndarray): Número de dispositivos não prioritários ligados em cada passo.
+            hora_dormir (int or numpy.ndarray, optional): Hora de dormir. Se None, usa a do ambiente.
+            hora_acordar (int or numpy.ndarray, optional): Hora de acordar. Se None, usa a do ambiente.
+
+        Returns:
+            numpy.ndarray: Recompensa de cada passo, no formato resultante do broadcast dos argumentos.
+        """
+        hora_dormir = self.hora_dormir if hora_dormir is None else hora_dormir
+        hora_acordar = self.hora_acordar if hora_acordar is None else hora_acordar
+        return self.avaliador_recompensa(
+            consumo_total, horas, ligados_prioritarios, ligados_comuns, hora_dormir, hora_acordar, self.calcular_limite_consumo()
+        )
+
+    def grade_recompensas(self):
+        """
+        Calcula a recompensa e o consumo de cada ação em cada hora do ambiente.
+
+        As recompensas são idênticas às de executar_passos. O consumo soma as potências em outra
+        ordem (prioritários e depois um produto matricial), então pode diferir do de executar_passos
+        no último bit (por exemplo, 1.2600000000000002 em vez de 1.26).
+
+        Returns:
+            tuple: Arrays (max_tempo, 2**numero_dispositivos) de recompensas e de consumos (kWh).
+        """
+        numero_dispositivos = len(self.dispositivos)
+        horas = np.arange(self.max_tempo)
+        prioritarios = self.mascara_prioritarios()
+        bits = (np.arange(2**numero_dispositivos)[:, None] >> np.arange(numero_dispositivos - 1, -1, -1)) & 1
+
+        ligados_prioritarios = prioritarios & (horas % 3 == 0)[:, None]
+        controlaveis = ~prioritarios & ~self.mascara_desligamento(horas)[:, None]
+        potencias = self.potencias_dispositivos() / 1000
+
+        consumo = (potencias * ligados_prioritarios).sum(axis=1)[:, None] + (potencias * controlaveis) @ bits.T
+        recompensa = self.calcular_recompensa_vetorizada(
+            consumo, horas[:, None], ligados_prioritarios.sum(axis=1)[:, None], controlaveis.astype(int) @ bits.T
+        )
+        return recompensa, consumo
+
     def calcular_limite_consumo(self):
         consumo_dispositivos = sum(dispositivo["consumo"] for dispositivo in self.dispositivos.values())
-        limite_base = consumo_dispositivos * 0.5
-        return limite_base
+        return self.avaliador_recompensa.calcular_limite(consumo_dispositivos)
 
     def executar_passos(self, acoes):
         """
@@ -88,7 +185,6 @@ class EnergyManagementEnvironment:
             tuple: Recompensa obtida, consumo total, e flag indicando se o episódio terminou.
         """
         consumo_total = 0
-        recompensa = 0
 
         for i, dispositivo in enumerate(self.dispositivos):
             if any(prio in dispositivo.lower() for prio in self.DISPOSITIVOS_PRIORITARIOS):
@@ -111,34 +207,18 @@ class EnergyManagementEnvironment:
 
             consumo_total += (self.dispositivos[dispositivo]["consumo"] / 1000) * self.dispositivos[dispositivo]["estado"]
 
-        limite_consumo = self.calcular_limite_consumo()
-        excesso_consumo = consumo_total - limite_consumo
-        if excesso_consumo > 0:
-            if excesso_consumo < 0.5:
-                penalidade_consumo = excesso_consumo * 15 
-            elif excesso_consumo < 1.0:
-                penalidade_consumo = excesso_consumo * 30 
-            else:
-                penalidade_consumo = excesso_consumo * 50
-            recompensa -= penalidade_consumo
-        else:
-            recompensa += 30 
-
-        if self.hora_dormir <= self.tempo or self.tempo < self.hora_acordar:
-            if consumo_total <= limite_consumo * 0.7:
-                recompensa += 10
-
-        if consumo_total < limite_consumo:
-            fator_recompensa = 0.05
-            economia = limite_consumo - consumo_total
-            recompensa += economia * fator_recompensa
-
+        ligados_prioritarios = 0
+        ligados_comuns = 0
         for dispositivo in self.dispositivos:
             if self.dispositivos[dispositivo]["estado"] == 1:
                 if any(prio in dispositivo.lower() for prio in self.DISPOSITIVOS_PRIORITARIOS):
-                    recompensa += 5
+                    ligados_prioritarios += 1
                 else:
-                    recompensa += 2
+                    ligados_comuns += 1
+
+        recompensa = self.avaliador_recompensa.avaliar_passo(
+            consumo_total, self.tempo, ligados_prioritarios, ligados_comuns, self.hora_dormir, self.hora_acordar, self.calcular_limite_consumo()
+        )
 
         self.tempo = (self.tempo + 1) % self.max_tempo
 
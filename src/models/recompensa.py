@@ -0,0 +1,179 @@
+import copy
+import bisect
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+ESPECIFICACAO_PADRAO = {
+    # Limite de consumo = soma das potências dos dispositivos (W) * fator.
+    "limite": {"fator": 0.5},
+    # Penalidade = excesso * multiplicador da primeira faixa cujo teto supera o excesso.
+    "excesso": {"faixas": [[0.5, 15], [1.0, 30]], "multiplicador_final": 50},
+    "dentro_limite": {"bonus": 30},
+    "noturno": {"bonus": 10, "fracao_limite": 0.7},
+    "economia": {"fator": 0.05},
+    "dispositivos_ligados": {"prioritario": 5, "comum": 2},
+}
+
+
+def _mesclar(base, alteracoes, caminho=""):
+    mesclado = copy.deepcopy(base)
+    for chave, valor in alteracoes.items():
+        if chave not in base:
+            raise ValueError(f"Chave desconhecida na especificação de recompensa: {caminho}{chave}.")
+        if isinstance(base[chave], dict):
+            if not isinstance(valor, dict):
+                raise ValueError(f"A chave {caminho}{chave} da especificação de recompensa deve ser uma tabela.")
+            mesclado[chave] = _mesclar(base[chave], valor, f"{caminho}{chave}.")
+        else:
+            mesclado[chave] = valor
+    return mesclado
+
+
+def carregar_especificacao(caminho):
+    """
+    Carrega uma especificação de recompensa de um arquivo TOML.
+
+    Args:
+        caminho (str): Caminho do arquivo TOML.
+
+    Returns:
+        dict: Especificação lida do arquivo.
+
+    Raises:
+        ValueError: Se não houver leitor de TOML disponível.
+    """
+    if tomllib is None:
+        raise ValueError("A leitura de TOML requer Python 3.11 ou o pacote tomli.")
+    with open(caminho, "rb") as arquivo:
+        return tomllib.load(arquivo)
+
+
+class AvaliadorRecompensa:
+    """
+    Avaliador vetorizado compilado a partir de uma especificação de recompensa.
+    """
+
+    def __init__(self, especificacao=None):
+        """
+        Compila a especificação em arrays e constantes usados pelas operações NumPy.
+
+        Args:
+            especificacao (dict, optional): Especificação parcial ou completa. As chaves ausentes usam
+                ESPECIFICACAO_PADRAO, que reproduz a recompensa original do ambiente.
+
+        Raises:
+            ValueError: Se a especificação tiver chaves desconhecidas ou faixas de excesso fora de ordem.
+        """
+        self.especificacao = _mesclar(ESPECIFICACAO_PADRAO, especificacao or {})
+        espec = self.especificacao
+
+        faixas = np.array(espec["excesso"]["faixas"], dtype=float).reshape(-1, 2)
+        if np.any(np.diff(faixas[:, 0]) <= 0):
+            raise ValueError("As faixas de excesso devem estar em ordem crescente de teto.")
+        self.tetos_excesso = faixas[:, 0]
+        self.multiplicadores_excesso = np.append(faixas[:, 1], espec["excesso"]["multiplicador_final"])
+        self._tetos_excesso_lista = self.tetos_excesso.tolist()
+        self._multiplicadores_excesso_lista = self.multiplicadores_excesso.tolist()
+
+        self.fator_limite = espec["limite"]["fator"]
+        self.bonus_dentro_limite = espec["dentro_limite"]["bonus"]
+        self.bonus_noturno = espec["noturno"]["bonus"]
+        self.fracao_limite_noturno = espec["noturno"]["fracao_limite"]
+        self.fator_economia = espec["economia"]["fator"]
+        self.bonus_prioritario = espec["dispositivos_ligados"]["prioritario"]
+        self.bonus_comum = espec["dispositivos_ligados"]["comum"]
+
+    @classmethod
+    def de_arquivo(cls, caminho):
+        """
+        Compila a especificação contida em um arquivo TOML.
+
+        Args:
+            caminho (str): Caminho do arquivo TOML.
+
+        Returns:
+            AvaliadorRecompensa: Avaliador compilado.
+        """
+        return cls(carregar_especificacao(caminho))
+
+    def calcular_limite(self, potencia_total):
+        """
+        Calcula o limite de consumo a partir da soma das potências dos dispositivos.
+
+        Args:
+            potencia_total (float): Soma das potências (W).
+
+        Returns:
+            float: Limite de consumo.
+        """
+        return potencia_total * self.fator_limite
+
+    def __call__(self, consumo_total, horas, ligados_prioritarios, ligados_comuns, hora_dormir, hora_acordar, limite_consumo):
+        """
+        Avalia a recompensa sobre arrays de passos.
+
+        Args:
+            consumo_total (numpy.ndarray): Consumo total (kWh) de cada passo.
+            horas (numpy.ndarray): Hora de cada passo.
+            ligados_prioritarios (numpy.ndarray): Número de dispositivos prioritários ligados em cada passo.
+            ligados_comuns (numpy.ndarray): Número de dispositivos não prioritários ligados em cada passo.
+            hora_dormir (int or numpy.ndarray): Hora de dormir.
+            hora_acordar (int or numpy.ndarray): Hora de acordar.
+            limite_consumo (float): Limite de consumo.
+
+        Returns:
+            numpy.ndarray: Recompensa de cada passo, no formato resultante do broadcast dos argumentos,
+            em float32 se o consumo for float32 e em float64 caso contrário.
+        """
+        # Somar o bônus só onde a condição vale (em vez de somar np.where(..., bônus, 0)) preserva
+        # o tipo de ponto flutuante do consumo: grades float32 não são promovidas a float64.
+        tipo = np.result_type(np.asarray(consumo_total).dtype, np.float32)
+        excesso_consumo = consumo_total - limite_consumo
+        multiplicador = self.multiplicadores_excesso.astype(tipo)[np.searchsorted(self.tetos_excesso, excesso_consumo, side="right")]
+        recompensa = np.where(excesso_consumo > 0, -(excesso_consumo * multiplicador), tipo.type(self.bonus_dentro_limite))
+
+        noite = (hora_dormir <= horas) | (horas < hora_acordar)
+        recompensa = np.where(noite & (consumo_total <= limite_consumo * self.fracao_limite_noturno), recompensa + self.bonus_noturno, recompensa)
+
+        recompensa = np.where(consumo_total < limite_consumo, recompensa + (limite_consumo - consumo_total) * self.fator_economia, recompensa)
+
+        return recompensa + (self.bonus_prioritario * ligados_prioritarios + self.bonus_comum * ligados_comuns)
+
+    def avaliar_passo(self, consumo_total, hora, ligados_prioritarios, ligados_comuns, hora_dormir, hora_acordar, limite_consumo):
+        """
+        Avalia a recompensa de um único passo sem NumPy, com as mesmas operações de __call__.
+
+        Args:
+            consumo_total (float): Consumo total (kWh) do passo.
+            hora (int): Hora do passo.
+            ligados_prioritarios (int): Número de dispositivos prioritários ligados.
+            ligados_comuns (int): Número de dispositivos não prioritários ligados.
+            hora_dormir (int): Hora de dormir.
+            hora_acordar (int): Hora de acordar.
+            limite_consumo (float): Limite de consumo.
+
+        Returns:
+            float: Recompensa do passo.
+        """
+        excesso_consumo = consumo_total - limite_consumo
+        if excesso_consumo > 0:
+            multiplicador = self._multiplicadores_excesso_lista[bisect.bisect_right(self._tetos_excesso_lista, excesso_consumo)]
+            recompensa = -(excesso_consumo * multiplicador)
+        else:
+            recompensa = float(self.bonus_dentro_limite)
+
+        if (hora_dormir <= hora or hora < hora_acordar) and consumo_total <= limite_consumo * self.fracao_limite_noturno:
+            recompensa += self.bonus_noturno
+
+        if consumo_total < limite_consumo:
+            recompensa += (limite_consumo - consumo_total) * self.fator_economia
+
+        return recompensa + (self.bonus_prioritario * ligados_prioritarios + self.bonus_comum * ligados_comuns)
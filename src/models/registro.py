@@ -0,0 +1,312 @@
+import os
+import glob
+import shutil
+import tempfile
+import numpy as np
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+COLUNAS_EPISODIOS = {"epoca": np.int64, "recompensa": np.float32, "consumo": np.float32, "epsilon": np.float32}
+COLUNAS_PASSOS = {"epoca": np.int64, "hora": np.int16, "acao": np.int32, "recompensa": np.float32, "consumo": np.float32}
+
+
+def criar_diretorio_registro(diretorio_base):
+    """
+    Cria um diretório de registro exclusivo dentro de diretorio_base.
+
+    O nome começa com a data e a hora (até microssegundos), para ordenar os registros
+    cronologicamente, e termina com um sufixo aleatório que evita colisões.
+
+    Args:
+        diretorio_base (str): Diretório que agrupa os registros.
+
+    Returns:
+        str: Caminho do diretório criado.
+    """
+    os.makedirs(diretorio_base, exist_ok=True)
+    return tempfile.mkdtemp(prefix=datetime.now().strftime("%Y%m%d_%H%M%S_%f_"), dir=diretorio_base)
+
+
+def limpar_registros(diretorio_base, maximo_registros, manter=()):
+    """
+    Apaga os registros mais antigos, mantendo apenas os maximo_registros mais recentes.
+
+    Args:
+        diretorio_base (str): Diretório que agrupa os registros.
+        maximo_registros (int): Número de registros mantidos, além dos listados em manter.
+        manter (iterable, optional): Diretórios que nunca são apagados (por exemplo, os referenciados pelo cache).
+
+    Returns:
+        list: Diretórios apagados.
+    """
+    if not os.path.isdir(diretorio_base):
+        return []
+    protegidos = {os.path.abspath(caminho) for caminho in manter if caminho}
+    registros = sorted(
+        (caminho for caminho in glob.glob(os.path.join(diretorio_base, "*")) if os.path.isdir(caminho)),
+        reverse=True,
+    )
+    candidatos = [caminho for caminho in registros if os.path.abspath(caminho) not in protegidos]
+    apagados = candidatos[maximo_registros:]
+    for caminho in apagados:
+        shutil.rmtree(caminho, ignore_errors=True)
+    return apagados
+
+
+class _Bloco:
+    """
+    Bloco pré-alocado de colunas tipadas.
+    """
+
+    def __init__(self, colunas, tamanho):
+        self.dados = {nome: np.empty(tamanho, dtype=tipo) for nome, tipo in colunas.items()}
+        self.tamanho = tamanho
+        self.posicao = 0
+
+    def adicionar(self, valores):
+        for nome, valor in zip(self.dados, valores):
+            self.dados[nome][self.posicao] = valor
+        self.posicao += 1
+        return self.posicao == self.tamanho
+
+    def preenchido(self):
+        return {nome: coluna[:self.posicao] for nome, coluna in self.dados.items()}
+
+
+class RegistroTreinamento:
+    """
+    Grava as métricas do treinamento em blocos colunares no disco, com memória limitada.
+    """
+
+    def __init__(self, diretorio, tamanho_bloco=65536, registrar_passos=False, tamanho_amostra=10000,
+                 amostragem="reservatorio", formato="npz", semente=None):
+        """
+        Inicializa o registro e cria o diretório de saída.
+
+        Args:
+            diretorio (str): Diretório onde os blocos são gravados.
+            tamanho_bloco (int, optional): Número de linhas por bloco gravado. Padrão é 65536.
+            registrar_passos (bool, optional): Se True, também grava as métricas de cada passo. Padrão é False.
+            tamanho_amostra (int, optional): Número máximo de episódios mantidos em memória. Padrão é 10000.
+            amostragem (str, optional): "reservatorio" (amostra uniforme) ou "passo" (um a cada n episódios). Padrão é "reservatorio".
+            formato (str, optional): "npz" ou "parquet" (requer pyarrow). Padrão é "npz".
+            semente (int, optional): Semente da amostragem por reservatório.
+
+        Raises:
+            ValueError: Se a amostragem ou o formato forem inválidos.
+        """
+        if amostragem not in ("reservatorio", "passo"):
+            raise ValueError(f"Amostragem {amostragem} inválida. Use 'reservatorio' ou 'passo'.")
+        if formato not in ("npz", "parquet"):
+            raise ValueError(f"Formato {formato} inválido. Use 'npz' ou 'parquet'.")
+        if formato == "parquet" and pq is None:
+            raise ValueError("O formato parquet requer o pacote pyarrow.")
+
+        self.diretorio = diretorio
+        self.tamanho_bloco = tamanho_bloco
+        self.registrar_passos = registrar_passos
+        self.tamanho_amostra = tamanho_amostra
+        self.amostragem = amostragem
+        self.formato = formato
+        self.rng = np.random.default_rng(semente)
+        os.makedirs(diretorio, exist_ok=True)
+
+        self.blocos = {"episodios": _Bloco(COLUNAS_EPISODIOS, tamanho_bloco)}
+        if registrar_passos:
+            self.blocos["passos"] = _Bloco(COLUNAS_PASSOS, tamanho_bloco)
+        self.numero_blocos = {tabela: 0 for tabela in self.blocos}
+
+        self.amostra_dados = _Bloco(COLUNAS_EPISODIOS, tamanho_amostra)
+        self.episodios_vistos = 0
+        self.passo_amostragem = 1
+        self.ultimo = None
+
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.gravacoes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def registrar_episodio(self, epoca, recompensa, consumo, epsilon):
+        """
+        Registra as métricas de um episódio.
+
+        Args:
+            epoca (int): Número do episódio.
+            recompensa (float): Recompensa total do episódio.
+            consumo (float): Consumo total do episódio (kWh).
+            epsilon (float): Taxa de exploração usada no episódio.
+        """
+        valores = (epoca, recompensa, consumo, epsilon)
+        self.ultimo = dict(zip(COLUNAS_EPISODIOS, valores))
+        self._adicionar("episodios", valores)
+        self._amostrar(valores)
+
+    def registrar_passo(self, epoca, hora, acao, recompensa, consumo):
+        """
+        Registra as métricas de um passo, se o registro de passos estiver ativo.
+
+        Args:
+            epoca (int): Número do episódio.
+            hora (int): Hora do passo.
+            acao (int): Ação tomada.
+            recompensa (float): Recompensa do passo.
+            consumo (float): Consumo do passo (kWh).
+        """
+        if self.registrar_passos:
+            self._adicionar("passos", (epoca, hora, acao, recompensa, consumo))
+
+    def _adicionar(self, tabela, valores):
+        if self.blocos[tabela].adicionar(valores):
+            self._descarregar(tabela)
+
+    def _descarregar(self, tabela):
+        bloco = self.blocos[tabela]
+        if bloco.posicao == 0:
+            return
+        caminho = os.path.join(self.diretorio, f"{tabela}_{self.numero_blocos[tabela]:06d}.{self.formato}")
+        self.gravacoes.append(self.executor.submit(self._gravar, caminho, bloco.preenchido()))
+        self.numero_blocos[tabela] += 1
+        colunas = COLUNAS_EPISODIOS if tabela == "episodios" else COLUNAS_PASSOS
+        self.blocos[tabela] = _Bloco(colunas, self.tamanho_bloco)
+
+    def _gravar(self, caminho, dados):
+        if self.formato == "parquet":
+            pq.write_table(pa.table(dados), caminho)
+        else:
+            np.savez(caminho, **dados)
+
+    def _amostrar(self, valores):
+        self.episodios_vistos += 1
+        amostra = self.amostra_dados
+
+        if self.amostragem == "reservatorio":
+            if amostra.posicao < amostra.tamanho:
+                amostra.adicionar(valores)
+            else:
+                indice = self.rng.integers(self.episodios_vistos)
+                if indice < amostra.tamanho:
+                    for nome, valor in zip(amostra.dados, valores):
+                        amostra.dados[nome][indice] = valor
+            return
+
+        if (self.episodios_vistos - 1) % self.passo_amostragem:
+            return
+        if amostra.posicao == amostra.tamanho:
+            # Amostra cheia: dobra o passo e mantém apenas os episódios que seguem o novo passo.
+            metade = (amostra.tamanho + 1) // 2
+            for coluna in amostra.dados.values():
+                coluna[:metade] = coluna[::2]
+            amostra.posicao = metade
+            self.passo_amostragem *= 2
+            if (self.episodios_vistos - 1) % self.passo_amostragem:
+                return
+        amostra.adicionar(valores)
+
+    def amostra(self):
+        """
+        Retorna a amostra em memória dos episódios, ordenada por época.
+
+        Returns:
+            dict: Arrays das colunas dos episódios amostrados.
+        """
+        dados = self.amostra_dados.preenchido()
+        ordem = np.argsort(dados["epoca"], kind="stable")
+        return {nome: coluna[ordem] for nome, coluna in dados.items()}
+
+    def fechar(self):
+        """
+        Grava os blocos pendentes e aguarda o fim das gravações em segundo plano.
+        """
+        for tabela in self.blocos:
+            self._descarregar(tabela)
+        for gravacao in self.gravacoes:
+            gravacao.result()
+        self.gravacoes = []
+        self.executor.shutdown()
+
+
+class LeitorRegistro:
+    """
+    Lê os blocos gravados por RegistroTreinamento sem carregar tudo na memória.
+    """
+
+    def __init__(self, diretorio):
+        """
+        Inicializa o leitor.
+
+        Args:
+            diretorio (str): Diretório do registro.
+        """
+        self.diretorio = diretorio
+
+    def arquivos(self, tabela="episodios"):
+        """
+        Lista os arquivos de blocos de uma tabela, em ordem.
+
+        Args:
+            tabela (str, optional): "episodios" ou "passos". Padrão é "episodios".
+
+        Returns:
+            list: Caminhos dos blocos.
+        """
+        return sorted(glob.glob(os.path.join(self.diretorio, f"{tabela}_*.npz")) + glob.glob(os.path.join(self.diretorio, f"{tabela}_*.parquet")))
+
+    def iterar_blocos(self, colunas, tabela="episodios"):
+        """
+        Percorre os blocos carregando apenas as colunas pedidas.
+
+        Args:
+            colunas (list): Nomes das colunas.
+            tabela (str, optional): "episodios" ou "passos". Padrão é "episodios".
+
+        Yields:
+            dict: Arrays das colunas de um bloco.
+        """
+        for caminho in self.arquivos(tabela):
+            if caminho.endswith(".parquet"):
+                if pq is None:
+                    raise ValueError("A leitura de arquivos parquet requer o pacote pyarrow.")
+                dados = pq.read_table(caminho, columns=list(colunas))
+                yield {nome: dados.column(nome).to_numpy() for nome in colunas}
+            else:
+                with np.load(caminho) as dados:
+                    yield {nome: dados[nome] for nome in colunas}
+
+    def __len__(self):
+        return sum(len(bloco["epoca"]) for bloco in self.iterar_blocos(["epoca"]))
+
+    def amostrar(self, colunas, max_pontos=5000, tabela="episodios"):
+        """
+        Lê as colunas pedidas mantendo no máximo max_pontos linhas igualmente espaçadas.
+
+        Args:
+            colunas (list): Nomes das colunas.
+            max_pontos (int, optional): Número máximo de linhas retornadas. Padrão é 5000.
+            tabela (str, optional): "episodios" ou "passos". Padrão é "episodios".
+
+        Returns:
+            dict: Arrays das colunas amostradas.
+        """
+        total = sum(len(bloco[colunas[0]]) for bloco in self.iterar_blocos(colunas[:1], tabela))
+        passo = max(1, -(-total // max_pontos))
+        partes = {nome: [] for nome in colunas}
+        inicio = 0
+        for bloco in self.iterar_blocos(colunas, tabela):
+            tamanho = len(bloco[colunas[0]])
+            deslocamento = (-inicio) % passo
+            for nome in colunas:
+                partes[nome].append(bloco[nome][deslocamento::passo])
+            inicio += tamanho
+        return {nome: np.concatenate(partes[nome]) if partes[nome] else np.array([]) for nome in colunas}
@@ -1,9 +1,13 @@
+import os
 import numpy as np
 import tkinter as tk
 import matplotlib.pyplot as plt
 from tkinter import ttk, messagebox
-from models.agent import QLearningAgent
+from models.agent import QLearningAgent, remapear_tabela_q
 from models.environment import EnergyManagementEnvironment
+from models.registro import RegistroTreinamento, LeitorRegistro, criar_diretorio_registro, limpar_registros
+from models.cache_politicas import CachePoliticas
+from views.lista_dispositivos import ListaDispositivosVirtual
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 
@@ -11,20 +15,32 @@ class EnergyManagementApp:
     """
     Interface gráfica para o gerenciador de energia utilizando Q-Learning.
     """
+    DIRETORIO_REGISTROS = "registros"
+    DIRETORIO_CACHE = "cache_politicas"
+    MAXIMO_REGISTROS = 20
+    NUMERO_EPOCAS = 10000
+    LIMITE_TOTAL_DISPOSITIVOS = 9
+    LIMITE_POR_DISPOSITIVO = 8
+
     def __init__(self, master):
         self.master = master
         self.master.title("Energy Save")
         self.master.configure(bg="#B0C4DE")
         self.agente = None
         self.tabela_q = None
+        self.dispositivos_tabela_q = []
         self.dispositivos = []
         self.recompensas = []
         self.consumos = []
+        self.diretorio_registro = None
         self.resultados_simulacao = []
         self.ambiente = None
         self.acoes_realizadas = []
         self.estados_dispositivos = {}
         self.quantidades_dispositivos = {}
+        self.indices_dispositivos = {}
+        self.total_dispositivos = 0
+        self.cache_politicas = CachePoliticas(self.DIRETORIO_CACHE)
         self.criar_widgets()
 
     def criar_widgets(self):
@@ -99,21 +115,10 @@ class EnergyManagementApp:
         self.frame_lista_dispositivos.grid_rowconfigure(0, weight=1)
         self.frame_lista_dispositivos.grid_columnconfigure(0, weight=1)
 
-        # Canvas para rolagem
-        self.canvas_dispositivos = tk.Canvas(self.frame_lista_dispositivos, borderwidth=0, height=100)
-        self.scrollbar_dispositivos = ttk.Scrollbar(self.frame_lista_dispositivos, orient="vertical", command=self.canvas_dispositivos.yview)
-        self.scrollable_frame_dispositivos = ttk.Frame(self.canvas_dispositivos)
-
-        self.scrollable_frame_dispositivos.bind("<Configure>", lambda e: self.canvas_dispositivos.configure(scrollregion=self.canvas_dispositivos.bbox("all")))
-
-        self.canvas_dispositivos.create_window((0, 0), window=self.scrollable_frame_dispositivos, anchor="nw")
-        self.canvas_dispositivos.configure(yscrollcommand=self.scrollbar_dispositivos.set)
-
-        self.canvas_dispositivos.pack(side="left", fill="both", expand=True)
-        self.scrollbar_dispositivos.pack(side="right", fill="y")
-
-        # Inicialização da lista de widgets de dispositivos
-        self.widgets_dispositivos = []
+        # Lista virtual: só as linhas visíveis têm widgets, reaproveitados na rolagem
+        self.lista_dispositivos = ListaDispositivosVirtual(
+            self.frame_lista_dispositivos, self.incrementar_quantidade, self.decrementar_quantidade, altura=100
+        )
 
         # Frame para Controles de Treinamento e Simulação
         self.frame_controle = ttk.LabelFrame(self.master, text="Controles de Treinamento e Simulação")
@@ -173,16 +178,17 @@ class EnergyManagementApp:
                 self.label_feedback.config(text="Erro: Dispositivo já existe. Use os botões para alterar a quantidade.", foreground="red")
                 return
 
-            total_dispositivos = sum(self.quantidades_dispositivos.values())
-            if total_dispositivos + 1 > 9:
-                self.label_feedback.config(text="Erro: Limite máximo de 9 dispositivos no total atingido.", foreground="red")
+            if self.total_dispositivos + 1 > self.LIMITE_TOTAL_DISPOSITIVOS:
+                self.label_feedback.config(text=f"Erro: Limite máximo de {self.LIMITE_TOTAL_DISPOSITIVOS} dispositivos no total atingido.", foreground="red")
                 return
 
             dispositivo = (nome_dispositivo, potencia_dispositivo, 1)
+            self.indices_dispositivos[nome_dispositivo] = len(self.dispositivos)
             self.dispositivos.append(dispositivo)
             self.quantidades_dispositivos[nome_dispositivo] = 1
+            self.total_dispositivos += 1
 
-            self.atualizar_lista_dispositivos()
+            self.lista_dispositivos.adicionar(*dispositivo)
             self.label_feedback.config(text=f"Dispositivo '{nome_dispositivo}' adicionado com sucesso!", foreground="green")
             self.entry_nome_dispositivo.delete(0, tk.END)
             self.entry_potencia.delete(0, tk.END)
@@ -190,49 +196,41 @@ class EnergyManagementApp:
         except ValueError:
             self.label_feedback.config(text="Erro: Potência deve ser um número válido.", foreground="red")
 
-    def atualizar_lista_dispositivos(self):
+    def atualizar_lista_dispositivos(self, nome_dispositivo=None):
         """
         Atualiza a lista de dispositivos na interface gráfica.
-        """
-        for widget in self.widgets_dispositivos:
-            widget.destroy()
-        self.widgets_dispositivos = []
-
-        for i, (nome_dispositivo, potencia, _) in enumerate(self.dispositivos):
-            quantidade = self.quantidades_dispositivos[nome_dispositivo]
-
-            self.dispositivos[i] = (nome_dispositivo, potencia, quantidade)
-
-            frame_dispositivo = ttk.Frame(self.scrollable_frame_dispositivos)
-            frame_dispositivo.pack(fill="x", padx=5, pady=2)
 
-            label_dispositivo = ttk.Label( frame_dispositivo, text=f"{nome_dispositivo} | Potência: {potencia} W | Quantidade: {quantidade}")
-            label_dispositivo.pack(side="left", padx=(0, 10))
-
-            botao_incrementar = ttk.Button( frame_dispositivo, text="+", width=3, command=lambda nome=nome_dispositivo: self.incrementar_quantidade(nome))
-            botao_incrementar.pack(side="left", padx=(0, 5))
-
-            botao_decrementar = ttk.Button(frame_dispositivo, text="-", width=3, command=lambda nome=nome_dispositivo: self.decrementar_quantidade(nome))
-            botao_decrementar.pack(side="left")
+        Args:
+            nome_dispositivo (str, optional): Dispositivo cuja quantidade mudou. Apenas a sua linha é
+                atualizada. Se None, a lista inteira é reconstruída a partir de self.dispositivos.
+        """
+        if nome_dispositivo is None:
+            self.lista_dispositivos.definir(self.dispositivos)
+            return
 
-            self.widgets_dispositivos.append(frame_dispositivo)
+        indice = self.indices_dispositivos[nome_dispositivo]
+        _, potencia, _ = self.dispositivos[indice]
+        quantidade = self.quantidades_dispositivos[nome_dispositivo]
+        self.dispositivos[indice] = (nome_dispositivo, potencia, quantidade)
+        self.lista_dispositivos.atualizar(nome_dispositivo, potencia, quantidade)
 
     def incrementar_quantidade(self, nome_dispositivo):
         """
         Incrementa a quantidade de dispositivos, até o máximo de 8 para cada dispositivo.
         Verifica se o total de dispositivos não ultrapassa o limite de 9.
         """
-        total_dispositivos = sum(self.quantidades_dispositivos.values())
+        quantidade = self.quantidades_dispositivos[nome_dispositivo]
 
-        if total_dispositivos < 9 and self.quantidades_dispositivos[nome_dispositivo] < 8:
+        if self.total_dispositivos < self.LIMITE_TOTAL_DISPOSITIVOS and quantidade < self.LIMITE_POR_DISPOSITIVO:
             self.quantidades_dispositivos[nome_dispositivo] += 1
-            self.atualizar_lista_dispositivos()
+            self.total_dispositivos += 1
+            self.atualizar_lista_dispositivos(nome_dispositivo)
             self.label_feedback.config(text="Quantidade do dispositivo incrementada com sucesso!", foreground="green")
         else:
-            if self.quantidades_dispositivos[nome_dispositivo] >= 8:
-                self.label_feedback.config(text="Erro: Limite máximo de 8 unidades para este dispositivo.", foreground="red")
+            if quantidade >= self.LIMITE_POR_DISPOSITIVO:
+                self.label_feedback.config(text=f"Erro: Limite máximo de {self.LIMITE_POR_DISPOSITIVO} unidades para este dispositivo.", foreground="red")
             else:
-                self.label_feedback.config(text="Erro: Limite máximo de 9 dispositivos no total atingido.", foreground="red")
+                self.label_feedback.config(text=f"Erro: Limite máximo de {self.LIMITE_TOTAL_DISPOSITIVOS} dispositivos no total atingido.", foreground="red")
 
     def decrementar_quantidade(self, nome_dispositivo):
         """
@@ -241,34 +239,49 @@ class EnergyManagementApp:
         """
         if self.quantidades_dispositivos[nome_dispositivo] > 1:
             self.quantidades_dispositivos[nome_dispositivo] -= 1
+            self.total_dispositivos -= 1
+            self.atualizar_lista_dispositivos(nome_dispositivo)
             self.label_feedback.config(text="Quantidade do dispositivo decrementada com sucesso!", foreground="green")
         else:
             self.remover_dispositivo_por_nome(nome_dispositivo)
-            self.label_feedback.config(text="Dispositivo removido com sucesso!", foreground="green")
-        self.atualizar_lista_dispositivos()
 
     def remover_dispositivo_por_nome(self, nome_dispositivo):
         """
         Remove o dispositivo da lista com base no nome.
         """
-        self.dispositivos = [d for d in self.dispositivos if d[0] != nome_dispositivo]
-        del self.quantidades_dispositivos[nome_dispositivo]
-        self.atualizar_lista_dispositivos()
+        self._remover_dispositivo(self.indices_dispositivos[nome_dispositivo])
         self.label_feedback.config(text="Dispositivo removido com sucesso!", foreground="green")
 
+    def _remover_dispositivo(self, indice):
+        """
+        Remove o dispositivo na posição indicada, mantendo índices e total atualizados.
+
+        Returns:
+            str: Nome do dispositivo removido.
+        """
+        indice = range(len(self.dispositivos))[indice]
+        nome_dispositivo = self.dispositivos[indice][0]
+        del self.dispositivos[indice]
+        del self.indices_dispositivos[nome_dispositivo]
+        for posicao in range(indice, len(self.dispositivos)):
+            self.indices_dispositivos[self.dispositivos[posicao][0]] = posicao
+        self.total_dispositivos -= self.quantidades_dispositivos.pop(nome_dispositivo)
+        self.lista_dispositivos.remover(nome_dispositivo)
+        return nome_dispositivo
+
     def remover_dispositivo_por_indice(self, indice):
         """
         Remove um dispositivo da lista com base no índice.
         """
         try:
-            nome_dispositivo = self.dispositivos[indice][0]
-            del self.dispositivos[indice]
-            del self.quantidades_dispositivos[nome_dispositivo]
-            self.atualizar_lista_dispositivos()
+            nome_dispositivo = self._remover_dispositivo(indice)
             if self.ambiente:
+                dispositivos_anteriores = list(self.ambiente.dispositivos)
                 self.ambiente.remover_dispositivo(nome_dispositivo)
-            if self.agente:
-                self.agente.atualizar_numero_dispositivos()
+                if self.agente:
+                    self.agente.atualizar_numero_dispositivos(dispositivos_anteriores)
+                    self.tabela_q = self.agente.tabela_q
+                    self.dispositivos_tabela_q = list(self.ambiente.dispositivos)
             self.label_status.config(text="Dispositivo removido com sucesso!", foreground="green")
         except IndexError:
             self.label_status.config(text="Erro ao remover dispositivo.", foreground="red")
@@ -313,17 +326,59 @@ class EnergyManagementApp:
 
         self.limpar_console()
         self.ambiente = EnergyManagementEnvironment(lista_dispositivos=self.dispositivos, hora_dormir=hora_dormir, hora_acordar=hora_acordar)
+        if self.tabela_q is not None and self.dispositivos_tabela_q != list(self.ambiente.dispositivos):
+            self.tabela_q = remapear_tabela_q(self.tabela_q, self.dispositivos_tabela_q, self.ambiente.dispositivos)
+            self.dispositivos_tabela_q = list(self.ambiente.dispositivos)
+            self.escrever_console("Tabela Q remapeada para os dispositivos atuais.\n")
         self.agente = QLearningAgent(self.ambiente, tabela_q=self.tabela_q)
         self.agente.atualizar_numero_dispositivos()
 
+        do_zero = self.tabela_q is None
+        configuracao = CachePoliticas.configuracao(self.ambiente, {
+            "alfa": self.agente.alfa,
+            "gama": self.agente.gama,
+            "epsilon": self.agente.epsilon,
+            "numero_epocas": self.NUMERO_EPOCAS,
+        })
+
+        metadados_cache = {}
+        if do_zero:
+            em_cache = self.cache_politicas.obter(configuracao)
+            if em_cache is not None:
+                self.tabela_q, metadados = em_cache
+                self.dispositivos_tabela_q = list(self.ambiente.dispositivos)
+                self.agente.tabela_q = self.tabela_q
+                self.recompensas = []
+                self.consumos = []
+                registro_em_cache = metadados.get("registro")
+                self.diretorio_registro = registro_em_cache if registro_em_cache and os.path.isdir(registro_em_cache) else None
+                self.escrever_console("Tabela Q recuperada do cache para esta configuração.\n")
+                self.label_status.config(text="Treinamento recuperado do cache!", foreground="green")
+                return
+
+            mais_proxima = self.cache_politicas.mais_proxima(configuracao)
+            if mais_proxima is not None:
+                # O resultado fica guardado na própria chave, registrando de qual entrada partiu.
+                tabela_q_inicial, chave_origem = mais_proxima
+                self.agente.tabela_q = tabela_q_inicial
+                metadados_cache["aquecido_de"] = chave_origem
+                self.escrever_console("Treinamento iniciado a partir da política em cache mais próxima.\n")
+
+        diretorio_registro = criar_diretorio_registro(self.DIRETORIO_REGISTROS)
+
         try:
-            recompensas, consumos, self.tabela_q = self.agente.treinar()
+            with RegistroTreinamento(diretorio_registro) as registro:
+                recompensas, consumos, self.tabela_q = self.agente.treinar(numero_epocas=self.NUMERO_EPOCAS, registro=registro)
+            self.dispositivos_tabela_q = list(self.ambiente.dispositivos)
             self.recompensas = recompensas
             self.consumos = consumos
+            self.diretorio_registro = diretorio_registro
 
-            self.texto_console.config(state="normal")
-            self.texto_console.insert(tk.END, f"Treinamento concluído. Recompensas: {recompensas[-1]:.2f}, Consumo: {consumos[-1]:.2f} kWh\n")
-            self.texto_console.config(state="disabled")
+            if do_zero:
+                self.cache_politicas.guardar(configuracao, self.tabela_q, dict(metadados_cache, registro=diretorio_registro))
+            limpar_registros(self.DIRETORIO_REGISTROS, self.MAXIMO_REGISTROS, manter=[self.diretorio_registro] + self.cache_politicas.registros())
+
+            self.escrever_console(f"Treinamento concluído. Recompensas: {registro.ultimo['recompensa']:.2f}, Consumo: {registro.ultimo['consumo']:.2f} kWh\n")
             self.label_status.config(text="Treinamento concluído!", foreground="green")
 
         except ValueError as ve:
@@ -381,7 +436,13 @@ class EnergyManagementApp:
         """
         Exibe os gráficos de recompensas e consumo durante o treinamento.
         """
-        if not self.recompensas or not self.consumos:
+        if self.diretorio_registro:
+            dados = LeitorRegistro(self.diretorio_registro).amostrar(["epoca", "recompensa", "consumo"])
+            epocas, recompensas, consumos = dados["epoca"], dados["recompensa"], dados["consumo"]
+        else:
+            epocas, recompensas, consumos = range(len(self.recompensas)), self.recompensas, self.consumos
+
+        if len(recompensas) == 0 or len(consumos) == 0:
             self.label_status.config(text="Por favor, realize um treinamento antes de exibir o gráfico.", foreground="red")
             return
 
@@ -390,10 +451,8 @@ class EnergyManagementApp:
 
         fig, ax = plt.subplots(1, 2, figsize=(12, 6))
 
-        epocas = range(len(self.recompensas))
-
-        recompensas_suavizadas = np.convolve(self.recompensas, np.ones(10)/10, mode='valid')
-        consumos_suavizados = np.convolve(self.consumos, np.ones(10)/10, mode='valid')
+        recompensas_suavizadas = np.convolve(recompensas, np.ones(10)/10, mode='valid')
+        consumos_suavizados = np.convolve(consumos, np.ones(10)/10, mode='valid')
 
         ax[0].plot(epocas[:len(recompensas_suavizadas)], recompensas_suavizadas, label="Recompensa Acumulada (suavizada)", color="blue", linewidth=2)
         ax[0].set_xlabel("Episódios")
@@ -523,6 +582,17 @@ class EnergyManagementApp:
         texto_q_table.insert(tk.END, f"Q-table:\n{tabela_q_str}")
         texto_q_table.config(state="disabled")
 
+    def escrever_console(self, texto):
+        """
+        Escreve um texto no console de saída.
+
+        Args:
+            texto (str): Texto a ser escrito.
+        """
+        self.texto_console.config(state="normal")
+        self.texto_console.insert(tk.END, texto)
+        self.texto_console.config(state="disabled")
+
     def limpar_console(self):
         """
         Limpa o console de saída.
@@ -0,0 +1,203 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class _LinhaDispositivo:
+    """
+    Linha reutilizável (rótulo e botões +/-) exibida pela lista virtual.
+    """
+
+    def __init__(self, canvas, ao_incrementar, ao_decrementar, vincular_rolagem):
+        self.nome = None
+        self.texto = None
+        self.ao_incrementar = ao_incrementar
+        self.ao_decrementar = ao_decrementar
+        self.frame = ttk.Frame(canvas)
+        self.label = ttk.Label(self.frame)
+        self.label.pack(side="left", padx=(0, 10))
+        self.botao_incrementar = ttk.Button(self.frame, text="+", width=3, command=self.incrementar)
+        self.botao_incrementar.pack(side="left", padx=(0, 5))
+        self.botao_decrementar = ttk.Button(self.frame, text="-", width=3, command=self.decrementar)
+        self.botao_decrementar.pack(side="left")
+        # A roda do mouse só chega ao widget sob o ponteiro, que quase sempre é uma linha, não o canvas.
+        for widget in (self.frame, self.label, self.botao_incrementar, self.botao_decrementar):
+            vincular_rolagem(widget)
+        self.janela = canvas.create_window((5, 0), window=self.frame, anchor="nw", state="hidden")
+
+    def exibir(self, nome, texto):
+        self.nome = nome
+        if texto != self.texto:
+            self.texto = texto
+            self.label.config(text=texto)
+
+    def incrementar(self):
+        if self.nome is not None:
+            self.ao_incrementar(self.nome)
+
+    def decrementar(self):
+        if self.nome is not None:
+            self.ao_decrementar(self.nome)
+
+
+class ListaDispositivosVirtual:
+    """
+    Lista rolável de dispositivos que só cria widgets para as linhas visíveis.
+
+    As linhas são indexadas pelo nome do dispositivo: alterar a quantidade de um dispositivo
+    atualiza apenas o rótulo da sua linha, e a rolagem reaproveita um conjunto fixo de linhas.
+    """
+
+    def __init__(self, master, ao_incrementar, ao_decrementar, altura=100, altura_linha=32):
+        """
+        Cria o canvas, a barra de rolagem e o conjunto inicial de linhas.
+
+        Args:
+            master (tk.Widget): Widget onde a lista é criada.
+            ao_incrementar (callable): Chamado com o nome do dispositivo ao clicar em "+".
+            ao_decrementar (callable): Chamado com o nome do dispositivo ao clicar em "-".
+            altura (int, optional): Altura inicial (px) da área visível. Padrão é 100.
+            altura_linha (int, optional): Altura (px) de cada linha. Padrão é 32.
+        """
+        self.ao_incrementar = ao_incrementar
+        self.ao_decrementar = ao_decrementar
+        self.altura_linha = altura_linha
+
+        self.nomes = []
+        self.indices = {}
+        self.textos = {}
+        self.linhas = []
+        self.linhas_por_nome = {}
+        self.primeira_visivel = 0
+
+        self.canvas = tk.Canvas(master, borderwidth=0, height=altura, yscrollincrement=altura_linha)
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self.rolar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", lambda e: self._ajustar_linhas(e.height))
+        self.vincular_rolagem(self.canvas)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._ajustar_linhas(altura)
+
+    @staticmethod
+    def formatar(nome, potencia, quantidade):
+        """
+        Monta o texto exibido na linha de um dispositivo.
+        """
+        return f"{nome} | Potência: {potencia} W | Quantidade: {quantidade}"
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def adicionar(self, nome, potencia, quantidade):
+        """
+        Adiciona um dispositivo ao fim da lista.
+
+        Args:
+            nome (str): Nome do dispositivo.
+            potencia (float): Potência (W).
+            quantidade (int): Quantidade.
+        """
+        self.indices[nome] = len(self.nomes)
+        self.nomes.append(nome)
+        self.textos[nome] = self.formatar(nome, potencia, quantidade)
+        self._atualizar_regiao()
+        if self.indices[nome] < self.primeira_visivel + len(self.linhas):
+            self._renderizar()
+
+    def atualizar(self, nome, potencia, quantidade):
+        """
+        Atualiza o texto de um dispositivo, redesenhando apenas a sua linha se estiver visível.
+
+        Args:
+            nome (str): Nome do dispositivo.
+            potencia (float): Potência (W).
+            quantidade (int): Quantidade.
+        """
+        self.textos[nome] = self.formatar(nome, potencia, quantidade)
+        linha = self.linhas_por_nome.get(nome)
+        if linha is not None:
+            linha.exibir(nome, self.textos[nome])
+
+    def remover(self, nome):
+        """
+        Remove um dispositivo da lista.
+
+        Args:
+            nome (str): Nome do dispositivo.
+        """
+        indice = self.indices.pop(nome)
+        del self.nomes[indice]
+        del self.textos[nome]
+        for posicao in range(indice, len(self.nomes)):
+            self.indices[self.nomes[posicao]] = posicao
+        self._atualizar_regiao()
+        # Com a lista rolada até o fim, encolher a região faz o canvas recuar a vista.
+        if indice < self.primeira_visivel + len(self.linhas) or self._primeira_visivel() != self.primeira_visivel:
+            self._renderizar()
+
+    def definir(self, dispositivos):
+        """
+        Substitui todo o conteúdo da lista.
+
+        Args:
+            dispositivos (list): Lista de dispositivos no formato [(nome, potencia, quantidade), ...].
+        """
+        self.nomes = [nome for nome, _, _ in dispositivos]
+        self.indices = {nome: indice for indice, nome in enumerate(self.nomes)}
+        self.textos = {nome: self.formatar(nome, potencia, quantidade) for nome, potencia, quantidade in dispositivos}
+        self._atualizar_regiao()
+        self._renderizar()
+
+    def rolar(self, *args):
+        """
+        Rola a lista (comando da barra de rolagem) e reposiciona as linhas visíveis.
+        """
+        self.canvas.yview(*args)
+        if self._primeira_visivel() != self.primeira_visivel:
+            self._renderizar()
+
+    def vincular_rolagem(self, widget):
+        """
+        Faz a roda do mouse sobre o widget rolar a lista (<MouseWheel> no Windows e macOS, botões 4 e 5 no X11).
+
+        Args:
+            widget (tk.Widget): Widget que repassa a rolagem para a lista.
+        """
+        widget.bind("<MouseWheel>", lambda e: self._rolar_roda(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self._rolar_roda(-1))
+        widget.bind("<Button-5>", lambda e: self._rolar_roda(1))
+
+    def _rolar_roda(self, unidades):
+        self.rolar("scroll", unidades, "units")
+        return "break"
+
+    def _ajustar_linhas(self, altura):
+        # Uma linha a mais cobre a linha parcialmente visível durante a rolagem.
+        necessarias = altura // self.altura_linha + 2
+        while len(self.linhas) < necessarias:
+            self.linhas.append(_LinhaDispositivo(self.canvas, self.ao_incrementar, self.ao_decrementar, self.vincular_rolagem))
+        self._renderizar()
+
+    def _primeira_visivel(self):
+        return max(0, int(self.canvas.canvasy(0) // self.altura_linha))
+
+    def _atualizar_regiao(self):
+        largura = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, largura, len(self.nomes) * self.altura_linha))
+
+    def _renderizar(self):
+        self.primeira_visivel = self._primeira_visivel()
+        self.linhas_por_nome = {}
+        for deslocamento, linha in enumerate(self.linhas):
+            indice = self.primeira_visivel + deslocamento
+            if indice >= len(self.nomes):
+                linha.nome = None
+                self.canvas.itemconfigure(linha.janela, state="hidden")
+                continue
+            nome = self.nomes[indice]
+            linha.exibir(nome, self.textos[nome])
+            self.canvas.coords(linha.janela, 5, indice * self.altura_linha)
+            self.canvas.itemconfigure(linha.janela, state="normal")
+            self.linhas_por_nome[nome] = linha
@@ -0,0 +1,104 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from models.agent import QLearningAgent, remapear_tabela_q
+from models.environment import EnergyManagementEnvironment
+
+
+def bits(acao, numero_dispositivos):
+    return [int(bit) for bit in format(acao, f"0{numero_dispositivos}b")]
+
+
+def acao(estados, dispositivos):
+    return int("".join(str(estados[nome]) for nome in dispositivos) or "0", 2)
+
+
+def remapear_por_enumeracao(tabela_q, anteriores, novos):
+    """
+    Referência direta: o valor de cada nova ação é o máximo das ações antigas que concordam
+    com ela em todos os dispositivos mantidos.
+    """
+    resultado = np.full((tabela_q.shape[0], 2**len(novos)), -np.inf)
+    for acao_anterior in range(2**len(anteriores)):
+        estados = dict(zip(anteriores, bits(acao_anterior, len(anteriores))))
+        adicionados = [nome for nome in novos if nome not in estados]
+        for estados_adicionados in itertools.product((0, 1), repeat=len(adicionados)):
+            estados_novos = dict(estados, **dict(zip(adicionados, estados_adicionados)))
+            acao_nova = acao(estados_novos, novos)
+            resultado[:, acao_nova] = np.maximum(resultado[:, acao_nova], tabela_q[:, acao_anterior])
+    return resultado
+
+
+def tabela_aleatoria(numero_dispositivos, semente=0):
+    return np.random.default_rng(semente).normal(size=(24, 2**numero_dispositivos))
+
+
+def test_reordenar_permuta_os_valores():
+    anteriores = ["a", "b", "c"]
+    novos = ["c", "a", "b"]
+    tabela_q = tabela_aleatoria(3)
+
+    remapeada = remapear_tabela_q(tabela_q, anteriores, novos)
+
+    for acao_anterior in range(8):
+        estados = dict(zip(anteriores, bits(acao_anterior, 3)))
+        np.testing.assert_array_equal(remapeada[:, acao(estados, novos)], tabela_q[:, acao_anterior])
+    # Uma permutação não mistura valores: o conjunto de cada hora é o mesmo.
+    np.testing.assert_array_equal(np.sort(remapeada, axis=1), np.sort(tabela_q, axis=1))
+
+
+def test_remover_usa_o_maximo_sobre_o_bit_removido():
+    tabela_q = tabela_aleatoria(3)
+
+    remapeada = remapear_tabela_q(tabela_q, ["a", "b", "c"], ["a", "c"])
+
+    # Ação nova (a, c) vem das ações antigas (a, 0, c) e (a, 1, c).
+    for a, c in itertools.product((0, 1), repeat=2):
+        esperado = np.maximum(tabela_q[:, acao({"a": a, "b": 0, "c": c}, "abc")], tabela_q[:, acao({"a": a, "b": 1, "c": c}, "abc")])
+        np.testing.assert_array_equal(remapeada[:, acao({"a": a, "c": c}, "ac")], esperado)
+
+
+def test_adicionar_repete_o_valor_nos_dois_bits():
+    tabela_q = tabela_aleatoria(2)
+
+    remapeada = remapear_tabela_q(tabela_q, ["a", "b"], ["a", "novo", "b"])
+
+    assert remapeada.shape == (24, 8)
+    for a, b in itertools.product((0, 1), repeat=2):
+        original = tabela_q[:, acao({"a": a, "b": b}, "ab")]
+        for novo in (0, 1):
+            np.testing.assert_array_equal(remapeada[:, acao({"a": a, "novo": novo, "b": b}, ["a", "novo", "b"])], original)
+
+
+@pytest.mark.parametrize("anteriores, novos", [
+    (["a", "b", "c"], ["a", "b", "c"]),
+    (["a", "b", "c"], ["b", "d", "a"]),
+    (["a", "b", "c", "d"], ["d"]),
+    (["a"], ["e", "a", "f"]),
+    (["a", "b"], ["c", "d"]),
+    (["a", "b"], []),
+])
+def test_remapear_coincide_com_enumeracao(anteriores, novos):
+    tabela_q = tabela_aleatoria(len(anteriores))
+    remapeada = remapear_tabela_q(tabela_q, anteriores, novos)
+    np.testing.assert_array_equal(remapeada, remapear_por_enumeracao(tabela_q, anteriores, novos))
+
+
+def test_remapear_rejeita_tabela_de_largura_errada():
+    with pytest.raises(ValueError):
+        remapear_tabela_q(np.zeros((24, 4)), ["a", "b", "c"], ["a", "b"])
+
+
+def test_atualizar_numero_dispositivos_remapeia_a_tabela():
+    ambiente = EnergyManagementEnvironment([("geladeira", 150, 1), ("televisao", 100, 1)], hora_dormir=22, hora_acordar=6)
+    tabela_q = tabela_aleatoria(2)
+    anteriores = list(ambiente.dispositivos)
+    agente = QLearningAgent(ambiente, tabela_q=tabela_q)
+
+    ambiente.dispositivos["lampada_1"] = {"consumo": 60, "estado": 0}
+    agente.atualizar_numero_dispositivos(anteriores)
+
+    assert agente.numero_acoes == 8
+    np.testing.assert_array_equal(agente.tabela_q, remapear_tabela_q(tabela_q, anteriores, ambiente.dispositivos))
@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+import pytest
+
+from models.cache_politicas import CachePoliticas
+from models.environment import EnergyManagementEnvironment
+
+
+HIPERPARAMETROS = {"alfa": 0.1, "gama": 0.9, "epsilon": 0.1, "numero_epocas": 10000}
+DISPOSITIVOS = [("geladeira", 150, 1), ("televisao", 100, 1)]
+
+
+def configuracao(dispositivos=DISPOSITIVOS, hora_dormir=22, hora_acordar=6, hiperparametros=HIPERPARAMETROS, **kwargs):
+    ambiente = EnergyManagementEnvironment(dispositivos, hora_dormir=hora_dormir, hora_acordar=hora_acordar, **kwargs)
+    return CachePoliticas.configuracao(ambiente, hiperparametros)
+
+
+def tabela(configuracao, valor=0.0):
+    return np.full((configuracao["max_tempo"], 2**len(configuracao["dispositivos"])), valor)
+
+
+def test_obter_recupera_e_persiste(tmp_path):
+    cache = CachePoliticas(str(tmp_path))
+    config = configuracao()
+    assert cache.obter(config) is None
+
+    tabela_q = np.arange(24 * 4, dtype=float).reshape(24, 4)
+    cache.guardar(config, tabela_q, {"registro": "r"})
+
+    recuperada, metadados = CachePoliticas(str(tmp_path)).obter(config)
+    np.testing.assert_array_equal(recuperada, tabela_q)
+    assert metadados == {"registro": "r"}
+    assert cache.obter(configuracao(hora_dormir=23)) is None
+
+
+def test_remove_a_entrada_menos_usada(tmp_path):
+    configs = [configuracao(hora_dormir=hora) for hora in (20, 21, 22)]
+    cache = CachePoliticas(str(tmp_path))
+    cache.guardar(configs[0], tabela(configs[0]))
+    tamanho_entrada = cache.indice[cache.chave(configs[0])]["tamanho"]
+    cache.tamanho_maximo = 2 * tamanho_entrada
+
+    cache.guardar(configs[1], tabela(configs[1]))
+    # Acessar a primeira entrada torna a segunda a menos usada.
+    assert cache.obter(configs[0]) is not None
+    cache.guardar(configs[2], tabela(configs[2]))
+
+    assert cache.obter(configs[1]) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), f"{cache.chave(configs[1])}.npy"))
+    assert cache.obter(configs[0]) is not None
+    assert cache.obter(configs[2]) is not None
+    assert CachePoliticas(str(tmp_path)).indice.keys() == cache.indice.keys()
+
+
+def test_mantem_a_entrada_recem_guardada_mesmo_acima_do_maximo(tmp_path):
+    cache = CachePoliticas(str(tmp_path), tamanho_maximo=1)
+    config = configuracao()
+    cache.guardar(config, tabela(config))
+    assert cache.obter(config) is not None
+
+    outra = configuracao(hora_dormir=23)
+    cache.guardar(outra, tabela(outra))
+    assert cache.obter(config) is None
+    assert cache.obter(outra) is not None
+
+
+def test_mais_proxima_respeita_distancia_maxima(tmp_path):
+    config = configuracao()
+    # Um dispositivo a mais soma 10 à distância.
+    com_lampada = configuracao(DISPOSITIVOS + [("lampada", 60, 1)])
+
+    cache = CachePoliticas(str(tmp_path), distancia_maxima=10)
+    cache.guardar(config, tabela(config))
+    assert cache.mais_proxima(com_lampada) is not None
+
+    cache.distancia_maxima = 9
+    assert cache.mais_proxima(com_lampada) is None
+    # Dez horas de diferença no horário de dormir também ultrapassam o limite.
+    assert cache.mais_proxima(configuracao(hora_dormir=12)) is None
+    assert cache.mais_proxima(configuracao(hora_dormir=23)) is not None
+
+
+@pytest.mark.parametrize("diferenca", [
+    {"hiperparametros": dict(HIPERPARAMETROS, alfa=0.2)},
+    {"especificacao_recompensa": {"dentro_limite": {"bonus": 10}}},
+    {"max_tempo": 12},
+])
+def test_mais_proxima_exige_mesma_recompensa_hiperparametros_e_horas(tmp_path, diferenca):
+    cache = CachePoliticas(str(tmp_path), distancia_maxima=1000)
+    config = configuracao()
+    cache.guardar(config, tabela(config))
+    assert cache.mais_proxima(configuracao(**diferenca)) is None
+
+
+def test_mais_proxima_escolhe_a_menor_distancia_e_remapeia(tmp_path):
+    cache = CachePoliticas(str(tmp_path))
+    longe = configuracao(hora_dormir=18)
+    perto = configuracao(hora_dormir=21)
+    cache.guardar(longe, tabela(longe, 1.0))
+    tabela_perto = np.arange(24 * 4, dtype=float).reshape(24, 4)
+    cache.guardar(perto, tabela_perto)
+
+    nova = configuracao(DISPOSITIVOS + [("lampada", 60, 1)])
+    tabela_q, chave = cache.mais_proxima(nova)
+
+    assert chave == cache.chave(perto)
+    assert tabela_q.shape == (24, 8)
+    # A lâmpada é o bit menos significativo: os dois valores do novo bit repetem a ação anterior.
+    np.testing.assert_array_equal(tabela_q[:, 0::2], tabela_perto)
+    np.testing.assert_array_equal(tabela_q[:, 1::2], tabela_perto)
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from models.cenarios import GeradorCenarios, avaliar_politica
+from models.environment import EnergyManagementEnvironment
+
+
+DISPOSITIVOS = [("geladeira", 150, 1), ("ar_condicionado", 1200, 1), ("televisao", 100, 2), ("lampada", 60, 2)]
+
+
+def cenarios_deterministicos(ambiente, numero_cenarios=3):
+    gerador = GeradorCenarios(ambiente, desvio_horarios=0, prob_disponibilidade=1, ruido_consumo=0, ruido_preco=0, semente=0)
+    return gerador.gerar(numero_cenarios)
+
+
+def simular_politica_gulosa(ambiente, tabela_q):
+    numero_dispositivos = len(ambiente.dispositivos)
+    custo = consumo_total = recompensa_total = 0
+    consumos = []
+    estado = ambiente.resetar()
+    terminado = False
+    while not terminado:
+        acoes = [int(bit) for bit in format(int(np.argmax(tabela_q[estado])), f"0{numero_dispositivos}b")]
+        recompensa, consumo, terminado = ambiente.executar_passos(acoes)
+        custo += consumo * ambiente.preco_energia[estado]
+        consumo_total += consumo
+        recompensa_total += recompensa
+        consumos.append(consumo)
+        estado = ambiente.tempo
+    return custo, consumo_total, recompensa_total, consumos
+
+
+@pytest.mark.parametrize("semente", range(10))
+@pytest.mark.parametrize("especificacao", [None, {"limite": {"fator": 0.0005}}])
+def test_avaliar_politica_reproduz_executar_passos(semente, especificacao):
+    rng = random.Random(semente)
+    hora_dormir, hora_acordar = rng.sample(range(24), 2)
+    ambiente = EnergyManagementEnvironment(
+        DISPOSITIVOS, hora_dormir=hora_dormir, hora_acordar=hora_acordar, especificacao_recompensa=especificacao
+    )
+    tabela_q = np.random.default_rng(semente).random((ambiente.max_tempo, 2**len(ambiente.dispositivos)))
+
+    resultado = avaliar_politica(ambiente, tabela_q, cenarios_deterministicos(ambiente))
+    custo, consumo, recompensa, _ = simular_politica_gulosa(ambiente, tabela_q)
+
+    np.testing.assert_allclose(resultado["custo"], custo, rtol=1e-5)
+    np.testing.assert_allclose(resultado["consumo"], consumo, rtol=1e-5)
+    np.testing.assert_allclose(resultado["recompensa"], recompensa, rtol=1e-4, atol=1e-3)
+
+
+@pytest.mark.parametrize("fator", [0.5, 0.4, 0.2])
+def test_violacoes_usam_limite_em_kwh(fator):
+    ambiente = EnergyManagementEnvironment(
+        DISPOSITIVOS, hora_dormir=22, hora_acordar=6, especificacao_recompensa={"limite": {"fator": fator}}
+    )
+    # Política que liga todos os dispositivos em todas as horas.
+    tabela_q = np.zeros((ambiente.max_tempo, 2**len(ambiente.dispositivos)))
+    tabela_q[:, -1] = 1
+
+    resultado = avaliar_politica(ambiente, tabela_q, cenarios_deterministicos(ambiente))
+    _, _, _, consumos = simular_politica_gulosa(ambiente, tabela_q)
+    limite_kwh = ambiente.calcular_limite_consumo() / 1000
+    esperadas = sum(consumo > limite_kwh for consumo in consumos)
+
+    assert esperadas > 0
+    assert (resultado["violacoes"] == esperadas).all()
+
+
+def test_avaliar_politica_rejeita_tabela_incompativel():
+    ambiente = EnergyManagementEnvironment(DISPOSITIVOS, hora_dormir=22, hora_acordar=6)
+    with pytest.raises(ValueError):
+        avaliar_politica(ambiente, np.zeros((24, 4)), cenarios_deterministicos(ambiente))
@@ -0,0 +1,270 @@
+import random
+
+import numpy as np
+import pytest
+
+from models.environment import EnergyManagementEnvironment
+from models.recompensa import AvaliadorRecompensa
+
+
+DISPOSITIVOS_PRIORITARIOS = ["geladeira", "frigobar"]
+NOMES = ["geladeira", "Frigobar", "ar_condicionado", "televisao", "lampada", "computador"]
+POTENCIAS = [5, 60, 100, 150, 1200, 2000]
+
+# Potências múltiplas de 250 W dão consumos exatos em kWh (0.25, 0.5, ...), então os excessos caem
+# exatamente sobre os tetos das faixas quando o limite também é exato.
+DISPOSITIVOS_FAIXAS = [("geladeira", 250, 1), ("televisao", 500, 1), ("ar_condicionado", 750, 1), ("lampada", 250, 1)]
+POTENCIA_TOTAL_FAIXAS = 1750
+JANELAS_SONO = [(22, 6), (2, 8), (10, 14)]
+ESPECIFICACAO_ALTERNATIVA = {
+    "excesso": {"faixas": [[0.25, 5], [0.75, 20], [1.0, 40]], "multiplicador_final": 80},
+    "dentro_limite": {"bonus": 12},
+    "noturno": {"bonus": 4, "fracao_limite": 0.5},
+    "economia": {"fator": 0.1},
+    "dispositivos_ligados": {"prioritario": 3, "comum": 1},
+}
+
+
+def executar_passo_original(dispositivos, tempo, hora_dormir, hora_acordar, acoes, fator_limite=0.5):
+    """
+    Cópia congelada da recompensa de EnergyManagementEnvironment.executar_passos antes da
+    especificação declarativa. Não alterar: é a referência da especificação padrão. Só o
+    fator do limite (0.5 no original) é parâmetro, para os testes alcançarem as faixas de excesso.
+    """
+    estados = {}
+    consumo_total = 0
+    recompensa = 0
+
+    for i, dispositivo in enumerate(dispositivos):
+        if any(prio in dispositivo.lower() for prio in DISPOSITIVOS_PRIORITARIOS):
+            if tempo % 3 == 0:
+                estados[dispositivo] = 1
+            else:
+                estados[dispositivo] = 0
+        else:
+            estados[dispositivo] = acoes[i]
+
+            if hora_dormir < hora_acordar:
+                desligar = hora_dormir <= tempo <= hora_acordar
+            else:
+                desligar = tempo >= hora_dormir or tempo <= hora_acordar
+
+            if desligar:
+                estados[dispositivo] = 0
+            else:
+                estados[dispositivo] = acoes[i]
+
+        consumo_total += (dispositivos[dispositivo] / 1000) * estados[dispositivo]
+
+    limite_consumo = sum(dispositivos.values()) * fator_limite
+    excesso_consumo = consumo_total - limite_consumo
+    if excesso_consumo > 0:
+        if excesso_consumo < 0.5:
+            penalidade_consumo = excesso_consumo * 15
+        elif excesso_consumo < 1.0:
+            penalidade_consumo = excesso_consumo * 30
+        else:
+            penalidade_consumo = excesso_consumo * 50
+        recompensa -= penalidade_consumo
+    else:
+        recompensa += 30
+
+    if hora_dormir <= tempo or tempo < hora_acordar:
+        if consumo_total <= limite_consumo * 0.7:
+            recompensa += 10
+
+    if consumo_total < limite_consumo:
+        fator_recompensa = 0.05
+        economia = limite_consumo - consumo_total
+        recompensa += economia * fator_recompensa
+
+    for dispositivo in dispositivos:
+        if estados[dispositivo] == 1:
+            if any(prio in dispositivo.lower() for prio in DISPOSITIVOS_PRIORITARIOS):
+                recompensa += 5
+            else:
+                recompensa += 2
+
+    return recompensa, consumo_total
+
+
+def executar_passo_especificacao(dispositivos, tempo, hora_dormir, hora_acordar, acoes, especificacao):
+    """
+    Referência direta (sem NumPy nem bisect) de uma especificação completa de recompensa.
+    """
+    estados = {}
+    for i, dispositivo in enumerate(dispositivos):
+        if any(prio in dispositivo.lower() for prio in DISPOSITIVOS_PRIORITARIOS):
+            estados[dispositivo] = int(tempo % 3 == 0)
+        else:
+            if hora_dormir < hora_acordar:
+                desligar = hora_dormir <= tempo <= hora_acordar
+            else:
+                desligar = tempo >= hora_dormir or tempo <= hora_acordar
+            estados[dispositivo] = 0 if desligar else acoes[i]
+
+    consumo_total = 0
+    for dispositivo in dispositivos:
+        consumo_total += (dispositivos[dispositivo] / 1000) * estados[dispositivo]
+
+    limite_consumo = sum(dispositivos.values()) * especificacao["limite"]["fator"]
+    excesso_consumo = consumo_total - limite_consumo
+    if excesso_consumo > 0:
+        multiplicador = especificacao["excesso"]["multiplicador_final"]
+        for teto, multiplicador_faixa in especificacao["excesso"]["faixas"]:
+            if excesso_consumo < teto:
+                multiplicador = multiplicador_faixa
+                break
+        recompensa = -(excesso_consumo * multiplicador)
+    else:
+        recompensa = float(especificacao["dentro_limite"]["bonus"])
+
+    if hora_dormir <= tempo or tempo < hora_acordar:
+        if consumo_total <= limite_consumo * especificacao["noturno"]["fracao_limite"]:
+            recompensa += especificacao["noturno"]["bonus"]
+
+    if consumo_total < limite_consumo:
+        recompensa += (limite_consumo - consumo_total) * especificacao["economia"]["fator"]
+
+    ligados_prioritarios = sum(estados[d] for d in dispositivos if any(prio in d.lower() for prio in DISPOSITIVOS_PRIORITARIOS))
+    ligados_comuns = sum(estados.values()) - ligados_prioritarios
+    bonus = especificacao["dispositivos_ligados"]
+    return recompensa + (bonus["prioritario"] * ligados_prioritarios + bonus["comum"] * ligados_comuns), consumo_total
+
+
+def gerar_ambiente(semente):
+    rng = random.Random(semente)
+    lista_dispositivos = [
+        (nome, rng.choice(POTENCIAS + [rng.uniform(1, 3000)]), rng.randint(1, 2))
+        for nome in rng.sample(NOMES, rng.randint(1, 4))
+    ]
+    hora_dormir, hora_acordar = rng.sample(range(24), 2)
+    return EnergyManagementEnvironment(lista_dispositivos, hora_dormir=hora_dormir, hora_acordar=hora_acordar)
+
+
+def iterar_passos(ambiente, referencia=None):
+    if referencia is None:
+        fator_limite = ambiente.avaliador_recompensa.fator_limite
+
+        def referencia(*passo):
+            return executar_passo_original(*passo, fator_limite=fator_limite)
+
+    numero_dispositivos = len(ambiente.dispositivos)
+    potencias = {nome: dispositivo["consumo"] for nome, dispositivo in ambiente.dispositivos.items()}
+    for hora in range(ambiente.max_tempo):
+        for acao in range(2**numero_dispositivos):
+            acoes = [int(bit) for bit in format(acao, f"0{numero_dispositivos}b")]
+            esperado = referencia(potencias, hora, ambiente.hora_dormir, ambiente.hora_acordar, acoes)
+            yield hora, acao, acoes, esperado
+
+
+def verificar_ambiente(ambiente, referencia=None):
+    """
+    Compara executar_passos e grade_recompensas com a referência em todas as horas e ações.
+
+    Returns:
+        list: Consumos esperados de cada passo, por hora, para conferir a cobertura dos ramos.
+    """
+    recompensas, consumos = ambiente.grade_recompensas()
+    consumos_esperados = []
+    for hora, acao, acoes, (recompensa_esperada, consumo_esperado) in iterar_passos(ambiente, referencia):
+        ambiente.tempo = hora
+        recompensa, consumo, _ = ambiente.executar_passos(acoes)
+        assert recompensa == recompensa_esperada
+        assert consumo == consumo_esperado
+        assert recompensas[hora, acao] == recompensa_esperada
+        # A grade soma as potências em outra ordem, então o consumo pode diferir no último bit.
+        assert consumos[hora, acao] == pytest.approx(consumo_esperado, rel=1e-12, abs=1e-12)
+        consumos_esperados.append((hora, consumo_esperado))
+    return consumos_esperados
+
+
+@pytest.mark.parametrize("semente", range(40))
+def test_executar_passos_e_grade_reproduzem_recompensa_original(semente):
+    verificar_ambiente(gerar_ambiente(semente))
+
+
+@pytest.mark.parametrize("hora_dormir, hora_acordar", JANELAS_SONO)
+@pytest.mark.parametrize("limite", [0.25, 0.5, 0.25 + 1e-9, 0.25 - 1e-9, 0.5 + 1e-9, 0.5 - 1e-9])
+def test_faixas_de_excesso_nos_tetos(hora_dormir, hora_acordar, limite):
+    fator = limite / POTENCIA_TOTAL_FAIXAS
+    ambiente = EnergyManagementEnvironment(
+        DISPOSITIVOS_FAIXAS, hora_dormir=hora_dormir, hora_acordar=hora_acordar, especificacao_recompensa={"limite": {"fator": fator}}
+    )
+    limite_consumo = ambiente.calcular_limite_consumo()
+    consumos = verificar_ambiente(ambiente)
+
+    excessos = {consumo - limite_consumo for _, consumo in consumos}
+    assert any(0 < excesso < 0.5 for excesso in excessos)
+    assert any(0.5 < excesso < 1.0 for excesso in excessos)
+    assert any(excesso > 1.0 for excesso in excessos)
+    assert any(abs(excesso - 0.5) < 1e-6 for excesso in excessos)
+    assert any(abs(excesso - 1.0) < 1e-6 for excesso in excessos)
+    if limite in (0.25, 0.5):
+        # Tetos exatos: o excesso igual ao teto usa a faixa seguinte, e consumo igual ao limite não tem economia.
+        assert {0.0, 0.5, 1.0} <= excessos
+    noite = [consumo for hora, consumo in consumos if hora_dormir <= hora or hora < hora_acordar]
+    assert any(consumo <= limite_consumo * 0.7 for consumo in noite)
+    if hora_dormir < hora_acordar:
+        # Com hora_dormir < hora_acordar, a condição noturna vale também fora da janela de desligamento,
+        # então há horas "noturnas" com consumo alto em que o bônus é recusado.
+        assert any(consumo > limite_consumo * 0.7 for consumo in noite)
+
+
+@pytest.mark.parametrize("hora_dormir, hora_acordar", JANELAS_SONO)
+@pytest.mark.parametrize("limite", [0.25, 0.5, 0.25 + 1e-9])
+def test_especificacao_alternativa(hora_dormir, hora_acordar, limite):
+    especificacao = dict(ESPECIFICACAO_ALTERNATIVA, limite={"fator": limite / POTENCIA_TOTAL_FAIXAS})
+    ambiente = EnergyManagementEnvironment(
+        DISPOSITIVOS_FAIXAS, hora_dormir=hora_dormir, hora_acordar=hora_acordar, especificacao_recompensa=especificacao
+    )
+
+    def referencia(*passo):
+        return executar_passo_especificacao(*passo, especificacao)
+
+    consumos = verificar_ambiente(ambiente, referencia)
+    excessos = {consumo - ambiente.calcular_limite_consumo() for _, consumo in consumos}
+    for teto in (0.25, 0.75, 1.0):
+        assert any(abs(excesso - teto) < 1e-6 for excesso in excessos)
+    assert any(excesso > 1.0 for excesso in excessos)
+
+
+def test_especificacao_alternativa_difere_da_padrao():
+    padrao = EnergyManagementEnvironment(DISPOSITIVOS_FAIXAS, hora_dormir=22, hora_acordar=6)
+    alternativa = EnergyManagementEnvironment(
+        DISPOSITIVOS_FAIXAS, hora_dormir=22, hora_acordar=6, especificacao_recompensa=ESPECIFICACAO_ALTERNATIVA
+    )
+    assert not np.array_equal(padrao.grade_recompensas()[0], alternativa.grade_recompensas()[0])
+
+
+def test_especificacao_com_chave_desconhecida():
+    with pytest.raises(ValueError):
+        AvaliadorRecompensa({"excesso": {"teto": 1}})
+    with pytest.raises(ValueError):
+        AvaliadorRecompensa({"excesso": {"faixas": [[1.0, 30], [0.5, 15]]}})
+
+
+@pytest.mark.parametrize("especificacao", [None, ESPECIFICACAO_ALTERNATIVA])
+def test_avaliador_float32_e_float64(especificacao):
+    avaliador = AvaliadorRecompensa(especificacao)
+    limite_consumo = 1.0
+    rng = np.random.default_rng(0)
+    horas = np.arange(24)[:, None]
+    consumo = rng.uniform(0, 3 * limite_consumo, size=(24, 2000)).astype(np.float32)
+    prioritarios = rng.integers(0, 3, size=(24, 2000))
+    comuns = rng.integers(0, 6, size=(24, 2000))
+
+    recompensa_64 = avaliador(consumo.astype(np.float64), horas, prioritarios, comuns, 22, 6, limite_consumo)
+    recompensa_32 = avaliador(consumo, horas, prioritarios.astype(np.float32), comuns.astype(np.float32), 22, 6, limite_consumo)
+
+    assert recompensa_64.dtype == np.float64
+    assert recompensa_32.dtype == np.float32
+    np.testing.assert_allclose(recompensa_32, recompensa_64, rtol=1e-5, atol=1e-4)
+
+    # Em float64 o resultado continua idêntico ao da avaliação escalar usada no treinamento.
+    esperado = [
+        [avaliador.avaliar_passo(float(consumo[hora, i]), hora, int(prioritarios[hora, i]), int(comuns[hora, i]), 22, 6, limite_consumo)
+         for i in range(consumo.shape[1])]
+        for hora in range(24)
+    ]
+    np.testing.assert_array_equal(recompensa_64, esperado)
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+from models.registro import LeitorRegistro, RegistroTreinamento, criar_diretorio_registro, limpar_registros
+
+
+NUMERO_EPISODIOS = 1000
+TAMANHO_BLOCO = 64
+
+
+def gravar(diretorio, numero_episodios=NUMERO_EPISODIOS, **kwargs):
+    with RegistroTreinamento(diretorio, tamanho_bloco=TAMANHO_BLOCO, semente=0, **kwargs) as registro:
+        for epoca in range(numero_episodios):
+            registro.registrar_episodio(epoca, float(epoca), 2.0 * epoca, 0.1)
+    return registro
+
+
+@pytest.mark.parametrize("tamanho_amostra", [100, 99, 2000])
+def test_amostra_reservatorio_limitada_e_ordenada(tmp_path, tamanho_amostra):
+    amostra = gravar(tmp_path, tamanho_amostra=tamanho_amostra).amostra()
+
+    epocas = amostra["epoca"]
+    assert len(epocas) == min(tamanho_amostra, NUMERO_EPISODIOS)
+    assert (np.diff(epocas) > 0).all()
+    assert epocas.min() >= 0 and epocas.max() < NUMERO_EPISODIOS
+    # As colunas continuam alinhadas depois das substituições do reservatório.
+    np.testing.assert_array_equal(amostra["recompensa"], epocas)
+    np.testing.assert_array_equal(amostra["consumo"], 2 * epocas)
+
+
+@pytest.mark.parametrize("tamanho_amostra", [100, 99, 64])
+@pytest.mark.parametrize("numero_episodios", [NUMERO_EPISODIOS, 1023, 1024, 1025])
+def test_amostra_por_passo_mantem_multiplos_do_passo(tmp_path, tamanho_amostra, numero_episodios):
+    registro = gravar(tmp_path, numero_episodios=numero_episodios, tamanho_amostra=tamanho_amostra, amostragem="passo")
+    amostra = registro.amostra()
+
+    passo = registro.passo_amostragem
+    assert passo > 1
+    np.testing.assert_array_equal(amostra["epoca"], np.arange(0, numero_episodios, passo))
+    assert len(amostra["epoca"]) <= tamanho_amostra
+    np.testing.assert_array_equal(amostra["recompensa"], amostra["epoca"])
+
+
+def test_registro_grava_varios_blocos(tmp_path):
+    gravar(tmp_path)
+    leitor = LeitorRegistro(tmp_path)
+
+    assert len(leitor.arquivos()) == -(-NUMERO_EPISODIOS // TAMANHO_BLOCO)
+    assert len(leitor) == NUMERO_EPISODIOS
+    epocas = np.concatenate([bloco["epoca"] for bloco in leitor.iterar_blocos(["epoca"])])
+    np.testing.assert_array_equal(epocas, np.arange(NUMERO_EPISODIOS))
+
+
+@pytest.mark.parametrize("max_pontos", [100, 70, 7, 5000])
+def test_leitor_amostra_igualmente_espacada_entre_blocos(tmp_path, max_pontos):
+    gravar(tmp_path)
+    dados = LeitorRegistro(tmp_path).amostrar(["epoca", "consumo"], max_pontos=max_pontos)
+
+    passo = -(-NUMERO_EPISODIOS // max_pontos)
+    np.testing.assert_array_equal(dados["epoca"], np.arange(0, NUMERO_EPISODIOS, passo))
+    np.testing.assert_array_equal(dados["consumo"], 2 * dados["epoca"])
+    assert len(dados["epoca"]) <= max_pontos
+
+
+def test_registro_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    gravar(tmp_path, formato="parquet")
+    leitor = LeitorRegistro(tmp_path)
+
+    assert len(leitor) == NUMERO_EPISODIOS
+    np.testing.assert_array_equal(leitor.amostrar(["epoca"], max_pontos=100)["epoca"], np.arange(0, NUMERO_EPISODIOS, 10))
+
+
+def test_limpar_registros_mantem_recentes_e_protegidos(tmp_path):
+    registros = [criar_diretorio_registro(str(tmp_path)) for _ in range(5)]
+    assert len(set(registros)) == 5
+
+    apagados = limpar_registros(str(tmp_path), 2, manter=[registros[0]])
+
+    assert sorted(apagados) == sorted(registros[1:3])
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(os.path.basename(r) for r in [registros[0]] + registros[3:])